@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Code to create all outputs in a single pass: the data is prepared once and the TBOX,
+ABOX, links and inferred graph are generated from the same dataframes.
+Input:
+    csv files of initial data from Lab 1 of Bondoc and Ganepola
+    data path
+    save path
+    outputs to write (--outputs tbox abox link inference, all by default)
+Output:
+    rdf file of TBOX (output_tbox.rdf) and of the closure of its hierarchies (output_hierarchy.rdf)
+    rdf file of ABOX (output_abox.rdf)
+    rdf file of ABOX links (output_link.rdf)
+    rdf file of TBOX and ABOX with inference turned on (output_graph_inference.rdf)
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+# Install libraries
+# !pip install rdflib
+# !pip install owlrl
+# !pip install Faker
+
+import os
+from rdflib import Graph, Namespace, RDF, XSD, RDFS
+import owlrl
+from faker import Faker
+from prepare import prepare
+from rdfs import materialize
+from hierarchy import closure_table
+from tbox import tbox_to_rdf
+from abox import (area_to_rdf, author_to_rdf, conference_to_rdf, journal_to_rdf, volume_to_rdf,
+                  proceeding_to_rdf, paper_to_rdf, review_to_rdf, hasauthor_to_rdf, hastopic_to_rdf,
+                  link_conference_to_rdf, link_journal_to_rdf, link_volume_to_rdf,
+                  link_proceeding_to_rdf, link_paper_to_rdf)
+from export import export
+from stats import Statistics, collect, save_statistics
+from options import parse_args
+
+#Create faker object
+fake = Faker()
+
+# Folder to save all output
+savefolder='../output'
+
+# Folder containing all data (csv)
+datafolder='../data'
+
+# Output format (--format xml|turtle|nt|nquads), compression (--compress gzip|zstd) and
+# maximum size of the N-Triples/N-Quads files (--max-bytes)
+args=parse_args()
+output_format, compress, max_bytes = args.format, args.compress, args.max_bytes
+# Outputs to write: 'tbox', 'abox', 'link', 'inference' (--outputs)
+outputs=args.outputs
+
+# RDFS closure: 'rdfs' uses the specialized materializer in rdfs.py, 'owlrl' the generic owlrl closure
+reasoner='rdfs'
+# Closure profile of the 'rdfs' reasoner: 'full' (same triples as owlrl) or 'lean' (only class
+# memberships and super-properties, without rdfs:Resource, literal and axiomatic triples)
+profile='full'
+
+os.chdir(datafolder)
+# Seed of the synthetic fields (drawn per entity from its id, see synth.Keyed)
+seed=123
+
+#=============================================================================#
+#                               PREPARE DATA                                  #
+#=============================================================================#
+
+# The TBOX does not need the data
+frames=prepare(fake, seed) if outputs!=['tbox'] else {}
+
+#=============================================================================#
+#                               DEFINE GRAPH                                  #
+#=============================================================================#
+
+sdm = Namespace('http://example.org/sdm#')
+
+NS = {
+    'sdm': sdm,
+    'rdf': RDF,
+    'rdfs': RDFS,
+    'xsd':XSD,
+}
+
+def new_graph():
+    'Empty graph with the prefixes of the project'
+    g = Graph()
+    for prefix, namespace in NS.items():
+        g.bind(prefix, namespace)
+    return g
+
+#=============================================================================#
+#                             GENERATE GRAPHS                                 #
+#=============================================================================#
+
+inference='inference' in outputs
+# Statistics of each output, counted as the triples are emitted
+statistics={name: Statistics() for name in ['abox', 'link']}
+
+#==============================================================================  TBOX
+if 'tbox' in outputs or inference:
+    tbox=new_graph()
+    tbox_to_rdf(tbox)
+    statistics['tbox']=Statistics.of(tbox)
+
+#==============================================================================  ABOX
+if 'abox' in outputs or inference:
+    abox=new_graph()
+    with collect(statistics['abox']):
+        area_to_rdf(abox, frames['area'])
+        author_to_rdf(abox, frames['author'])
+        conference_to_rdf(abox, frames['conference'])
+        journal_to_rdf(abox, frames['journal'])
+        volume_to_rdf(abox, frames['volume'])
+        proceeding_to_rdf(abox, frames['proceeding'])
+        paper_to_rdf(abox, frames['paper'])
+        review_to_rdf(abox, frames['review'])
+        hasauthor_to_rdf(abox, frames['hasAuthor'])
+        hastopic_to_rdf(abox, frames['hasTopic'])
+
+#==============================================================================  LINKS
+if 'link' in outputs or inference:
+    link=new_graph()
+    with collect(statistics['link']):
+        link_conference_to_rdf(link, frames['conference'])
+        link_journal_to_rdf(link, frames['journal'])
+        link_volume_to_rdf(link, frames['volume'])
+        link_proceeding_to_rdf(link, frames['proceeding'])
+        link_paper_to_rdf(link, frames['paper'])
+
+#=============================================================================#
+#                                  EXPORT                                     #
+#=============================================================================#
+
+os.chdir(savefolder)
+for name in ['tbox','abox','link']:
+    if name in outputs:
+        export(globals()[name], f'output_{name}', output_format, compress, max_bytes)
+        save_statistics(statistics[name], f'output_{name}')
+if 'tbox' in outputs:
+    # rdfs:subClassOf* and rdfs:subPropertyOf* table for the local query path (hierarchy.py)
+    export(closure_table(tbox), 'output_hierarchy', output_format, compress, max_bytes)
+
+#==============================================================================  INFERENCE
+# TBOX + ABOX + links (same graph as B) with the RDFS closure
+if inference:
+    g=new_graph()
+    for part in [tbox, abox, link]:
+        g.addN((s, p, o, g) for s, p, o in part)
+    del tbox, abox, link
+
+    # Cardinalities of the written graph for the query optimizer (optimize.py): the asserted
+    # outputs and the triples added by the materializer
+    stats=Statistics()
+    for name in ['tbox', 'abox', 'link']:
+        stats.merge(statistics[name])
+    if reasoner=='owlrl':
+        engine = owlrl.RDFSClosure.RDFS_Semantics(g,False,False,False)
+        engine.closure()
+        engine.flush_stored_triples()
+        # owlrl adds its triples to g directly, so the closed graph is counted again
+        stats=Statistics.of(g)
+    else:
+        with collect(stats):
+            print('Inferred triples:', materialize(g, profile=profile, verbose=True))
+    export(g, 'output_graph_inference', output_format, compress, max_bytes)
+    save_statistics(stats, 'output_graph_inference')
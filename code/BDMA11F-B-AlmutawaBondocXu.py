@@ -6,6 +6,8 @@ Input:
     data path
     save path
 Output: rdf file of TBOX and ABOX with inference turned on (output_graph_inferenece.rdf)
+        or, in an incremental run, the triples to add and delete in it
+        (output_graph_inference_add.nt, output_graph_inference_delete.nt)
 """
 
 
@@ -19,14 +21,21 @@ Output: rdf file of TBOX and ABOX with inference turned on (output_graph_inferen
 # !pip install Faker
 
 import pandas as pd
-import numpy as np
-import os, gc
-import random
-from rdflib import Graph, Namespace, URIRef, Literal, RDF, XSD, RDFS
-import re
-from datetime import datetime
+import os
+from rdflib import Graph, Namespace, RDF, XSD, RDFS
+from export import export
+from stats import Statistics, collect, save_statistics
+from options import parse_args
 import owlrl
 from faker import Faker
+from prepare import prepare
+from rdfs import materialize, Closure
+from incremental import (CLOSURE_MANIFEST, has_manifest, save_manifest, changes, write_changes,
+                         save_closure, load_closure)
+from tbox import tbox_to_rdf
+from triples import pool
+from abox import (area_to_rdf, author_to_rdf, conference_to_rdf, journal_to_rdf, volume_to_rdf,
+                  proceeding_to_rdf, paper_to_rdf, review_to_rdf, hasauthor_to_rdf, hastopic_to_rdf)
 
 #Create faker object
 fake = Faker()
@@ -37,257 +46,31 @@ savefolder='../output'
 # Folder containing all data (csv)
 datafolder='../data'
 
+# Output format (--format xml|turtle|nt|nquads), compression (--compress gzip|zstd) and
+# maximum size of the N-Triples/N-Quads files (--max-bytes)
+args=parse_args()
+output_format, compress, max_bytes = args.format, args.compress, args.max_bytes
+
+# RDFS closure: 'rdfs' uses the specialized materializer in rdfs.py, 'owlrl' the generic owlrl closure
+reasoner='rdfs'
+# Closure profile of the 'rdfs' reasoner: 'full' (same triples as owlrl) or 'lean' (only class
+# memberships and super-properties, without rdfs:Resource, literal and axiomatic triples)
+profile='full'
+# Incremental run (--incremental, 'rdfs' reasoner and 'full' profile only): update the closure of
+# the previous incremental run with the ABOX changes and only write the inferred graph triples to
+# add and delete
+incremental=args.incremental and reasoner=='rdfs' and profile=='full'
+
 os.chdir(datafolder)
-random.seed(123)
+# Seed of the synthetic fields (drawn per entity from its id, see synth.Keyed)
+seed=123
 
 #=============================================================================# 
 #                               PREPARE DATA                                  # 
 #=============================================================================# 
 
-#============================================================================== FUNCTIONS
-def convert_to_dt(df):
-    'Converts date columns (inferred from column names) into pandas datetime types'
-    for col in [i for i in df.columns if 'date' in i.lower() or i.endswith('dt')]:
-        print(f'To date: {col}')
-        df[col]=pd.to_datetime(df[col])
-
-def to_camel_case(text):
-    """
-    Convert string to camel case (no spaces)
-    """
-    x=[i for i in text]
-    return ''.join(sum([],[x[0].upper()]+x[1:]))
-
-#============================================================================== AUTHOR 
-# Read authors and merge institution
-author=pd.read_csv('authors.csv').merge(pd.read_csv('institutions.csv').rename(columns={'intitutionid':'institutionid',
-                                                                                       'name':'institution'}), 
-                                        on='institutionid').drop(columns='institutionid').drop(columns=['affiliations','homepage','fake'])
-# Add aditional information
-author['sex']=pd.Series([random.randint(1, 2) for i in range(len(author))]).map({1:'Female',2:'Male'})
-author['birthdate']=[fake.date() for i in range(len(author))]
-author['originCountry']=[fake.country() for i in range(len(author))]
-author['hIndex']=author.hIndex.fillna(pd.Series([random.randint(1,10) for i in range(len(author))]))
-
-# Clean up
-author=author.dropna().reset_index(drop=True).rename(columns={'authorId':'author'})
-author.drop(columns=['paperCount','citationCount'], inplace=True)
-convert_to_dt(author)
-
-#============================================================================== PAPER
-# Read paper
-paper=pd.read_csv('paper.csv').drop(columns=['sha','fake']).rename(columns={'id':'paper'})
-
-# Synthesize new fields
-paper['wordcount']=[random.randint(4000,7000) for i in range(len(paper))]
-paper['abstract']=paper.abstract.fillna(pd.Series([fake.paragraph() for i in range(len(paper))]))
-paper['type']=[random.sample(['short','demo','full','poster'], 1)[0] for i in range(len(paper))]
-paper['doi']=[f'http://doi.org/{fake.iana_id()}/{fake.ipv4()}' for i in range(len(paper))]
-paper.drop(columns=['url'], inplace=True)
-
-# Merge paper information with conference and journal publication match
-paper=pd.concat(
-    [
-        (pd.read_csv('submitted_to_conference.csv').merge(pd.read_csv('holds.csv').drop(columns=['fake']), on='edition')
-         .drop(columns=['fake'])),
-        (pd.read_csv('submitted_to_journal.csv').merge(pd.read_csv('volume_of.csv').drop(columns=['fake']), on='volume')
-         .drop(columns=['fake']))
-    ]
-).drop_duplicates().merge(paper, on='paper')
-
-# Fill in null dates
-dts=pd.Series([fake.date() for i in range(len(paper))])
-paper['published_date']=paper['published_date'].fillna(dts)
-paper['submitted_date']=paper['submitted_date'].fillna(dts)
-
-# Unify columns
-paper['venue_type']=np.where(paper.conference.notna(), 'Conference', 'Journal')
-paper['venue']=paper.conference.fillna(paper.journal)
-paper['publication']=paper.edition.fillna(paper.volume)
-paper.drop(columns=['edition','conference','volume','journal'], inplace=True)
-
-# Since editions will now be conference conepts, all papers submitted to a conference will use the id of its proceeding as id for the conference
-m=paper.venue_type=='Conference'
-paper.loc[m, ['venue']] = (
-    paper.loc[m, ['publication']].values)
-
-convert_to_dt(paper)
-
-#### PAPER CONSTRAINTS
-
-# Submission date is less then published date
-m=paper.submitted_date>paper.published_date
-paper.loc[m, ['published_date', 'submitted_date']] = (
-    paper.loc[m, ['submitted_date', 'published_date']].values)
-
-# Poster can only be in conference. if not conference, change type
-paper.loc[(paper.type=='poster')&(paper.venue_type=='Journal'),
-          'type']=pd.Series([random.sample(['short','demo','full'], 1)[0] for i in range(len(paper))])
-
-# Infer publication date from paper published dates
-published=paper.groupby(['venue_type','venue','publication']).agg({'published_date':max,'submitted_date':min}).reset_index()
-published['published_date']=published[['published_date','submitted_date']].max(axis=1)
-published.drop(columns=['submitted_date'], inplace=True)
-submitted=paper[['paper','submitted_date','venue_type','venue','publication']].copy()
-
-# Get decision per paper
-decision=pd.read_csv('reviews.csv').groupby('paper').agg({'decision':['sum','count']})
-decision=((decision.iloc[:,0]/decision.iloc[:,1])>0.5).to_dict()
-paper['decision']=paper.paper.map(decision)
-
-# Delete values for non-approved papers based on review decisions
-for col in ['published_date','publication','doi']:
-    print(col)
-    paper.loc[(paper.decision==False)&(paper[col].notna()),[col]]=np.nan
-
-paper.drop(columns=['published_date'], inplace=True)
-
-# Create submission id -- note: submission and paper has a one to one relationship, as stated in the assumptions
-paper['submission']='sub-'+paper.paper.astype(int).astype(str)
-
-
-#============================================================================== REVIEWS
-# Read reviews
-review=pd.read_csv('reviews.csv').rename(columns={'reviewerid':'reviewer'})
-
-# Get dates
-review=(submitted
- .merge(published, on=['venue_type','venue','publication'], how='outer')
- .merge(review, on=['paper'], how='right')
-)
-review['reviewDate']=[fake.date_between_dates(j['submitted_date'], j['published_date']) for i,j in review.iterrows()]
-review.drop(columns=['venue_type','venue','publication','submitted_date','published_date'], inplace=True)
-review['review']=review['paper'].astype(str)+'-'+review['reviewer'].astype(str)
-
-#create submission id instead of paper id 
-review['submission']='sub-'+review.paper.astype(int).astype(str)
-review.drop(columns=['paper'], inplace=True)
-
-#============================================================================== CONFERENCE
-# Note: using edition as conference title
-conference=(pd.read_csv('conference.csv').rename(columns={'id':'conference'})
-            .merge(pd.read_csv('holds.csv').drop(columns=['fake']), on=['conference'])
-           .merge(pd.read_csv('edition.csv').rename(columns={'id':'edition'}).drop(columns=['fake','conference']), on='edition')
-           .rename(columns={'venue':'location'})
-            .drop(columns=['url'])
-            .rename(columns={'edition':'title','name':'conferenceSeries'})
-           .drop_duplicates()
-           )
-conference['conference']=conference['proceeding'].copy()
-conference['title']=conference['year'].astype(str) + ' ' + conference['conferenceSeries']
-conference['type']=[random.sample(['workshop', 'symposium', 'expert group','regular'], 1)[0] for i in range(len(conference))]
-
-# SENSE CHECK: Check for conference series with more than one conference -- there is one series with 2 conferences
-conference[conference.duplicated(subset=['conferenceSeries'], keep=False)]
-
-# generate more fake fields
-conference['issn']=conference.issn.fillna(pd.Series([fake.ssn() for i in range(len(conference))]))
-conference['publisher']=[fake.company() for i in range(len(conference))]
-
-# Get published date
-conference=(conference.merge(published[published.venue_type=='Conference']
-                  .rename(columns={'venue':'conference','publication':'proceeding'}))
-            .drop(columns=['venue_type'])
-)
-
-# If organizer is not an author, make null then order
-conference.loc[~conference.chairperson.isin(author.author),'chairperson']=np.nan
-conference.sort_values(['conference','title','chairperson'], inplace=True)
-
-# Separate conference and proceeding: note that there is a one to one correspondence for them
-cols=['title','chairperson','location','Start','End','year','conferenceSeries','type']
-proceeding=conference.copy()
-conference=conference[['conference']+cols].drop_duplicates().reset_index(drop=True).rename(columns={'chairperson':'organizer'})
-proceeding.drop(columns=cols, inplace=True)
-
-#============================================================================== JOURNAL
-# Note: using volume id as volume as proceeding name
-journal=(pd.read_csv('journal.csv').rename(columns={'id':'journal'})
-            .merge(pd.read_csv('volume_of.csv').drop(columns=['fake']), on=['journal'])
-           .merge(pd.read_csv('volume.csv').drop(columns=['volume']).rename(columns={'id':'volume'}).drop(columns=['fake']), on='volume')
-           .drop_duplicates()
-         .drop(columns=['url'])
-         .rename(columns={'name':'title'})
-        )
-# Fill in null titles
-titles=journal[['journal','title']].drop_duplicates().reset_index(drop=True)
-titles.loc[titles.title.isna(), 'title']=pd.Series([i for i in 'Journal of '+fake.word() for i in range(len(titles))])
-journal['title']=journal.journal.map(titles.set_index('journal').title.to_dict())
-del titles
-
-# Get published date
-journal=(journal.merge(published[published.venue_type=='Journal']
-                  .rename(columns={'venue':'journal','publication':'volume'}))
-            .drop(columns=['venue_type'])
-)
-
-# generate more fake fields
-journal['issn']=journal.issn.fillna(pd.Series([fake.ssn() for i in range(len(journal))]))
-journal['publisher']=[fake.company() for i in range(len(journal))]
-journal.drop(columns=['year'], inplace=True)
-
-# If organizer is not an author, make null then order
-journal.loc[~journal.editor.isin(author.author),'editor']=np.nan
-journal.sort_values(['journal','title','editor'], inplace=True)
-
-# Separate journal and volume
-cols=['title','editor']
-volume=journal.copy()
-journal=journal[['journal']+cols].groupby(['journal','title']).head(1).reset_index(drop=True).rename(columns={'editor':'organizer'})
-volume.drop(columns=cols, inplace=True)
-
-#============================================================================== AUTHORSHIP
-# Make sure authors and papers are in the main dataframes (to make sure they have propoerties)
-hasAuthor=pd.read_csv('writes.csv').drop(columns=['fake'])
-hasAuthor=hasAuthor.dropna().reset_index(drop=True)
-hasAuthor=hasAuthor[hasAuthor.paper.isin(paper.paper)&(hasAuthor.author.isin(author.author))].reset_index(drop=True)
-
-#============================================================================== ORGANIZERS
-# Fill null organizers in journal and conference - make sure they are not authors in the same conference edition/journal
-a_list=set(author.author.unique())
-for df in ['conference','journal']:
-    print(df)
-    nulls=globals()[df][globals()[df].organizer.isna()]
-    for i in nulls[df]:
-        a=set(paper.loc[(paper.venue_type==to_camel_case(df))&(paper.venue==i),
-                      ['paper']].merge(hasAuthor, on='paper').author.unique())
-        globals()[df].loc[globals()[df][df]==i,'organizer']=np.random.choice(list(a_list-a))
-print(conference.organizer.isna().sum(), journal.organizer.isna().sum())
-
-del nulls, a_list
-
-# Edit Paper/submission
-# Get information about the chair/editor that assigned reviewers for that submission
-org=pd.concat([conference[['conference','organizer']].assign(venue_type='Conference').rename(columns={'conference':'venue'}),
-           journal[['journal','organizer']].assign(venue_type='Journal').rename(columns={'journal':'venue'})]).drop_duplicates()
-
-paper=paper.merge(org, on=['venue_type','venue'], how='left')
-
-#============================================================================== ID DATATYPES
-# Convert selected id columns to int64
-df_list = [var for var in dir() if isinstance(eval(var), pd.core.frame.DataFrame)]
-for df in df_list:
-    cols=[i for i in globals()[df].columns if i in ['author', 'organizer', 'paper', 'reviewer']]
-    if len(cols)>0:
-        print('\n\n=======',df,'=======')
-        for col in cols:
-            print(col)
-            globals()[df][col]=(globals()[df][col]).astype('int64')
-            
-#============================================================================== AREA
-area=pd.read_csv('topic.csv', usecols=['community']).rename(columns={'community':'topicName'}).drop_duplicates().reset_index(drop=True)
-area['area']='area-'+area.index.astype(str)
-
-#============================================================================== HASTOPIC
-hasTopic=[]
-for df in ['paper','journal','volume','conference','proceeding']:
-    hasTopic.append(globals()[df][[df]].rename(columns={df:'id'}).assign(typ=df))
-hasTopic=pd.concat(hasTopic, ignore_index=True)
-hasTopic['area']=[random.sample(list(area.area.unique()), 1)[0] for i in range(len(hasTopic))]
-hasTopic=hasTopic.merge(area, on=['area'])
-
-del org, published, submitted
-gc.collect()
+frames=prepare(fake, seed)
+df_list=list(frames)
 
 #=============================================================================# 
 #                               DEFINE GRAPH                                  # 
@@ -313,551 +96,48 @@ NS = {
 #                                DEFINE TBOX                                  # 
 #=============================================================================# 
 
-#==============================================================================  CONCEPTS
-# Author concept 
-g.add((sdm.Author,RDFS.subClassOf, sdm.Person))
-# Organizer concept
-g.add((sdm.Organizer,RDFS.subClassOf, sdm.Author))
-# Chair concept
-g.add((sdm.Chair,RDFS.subClassOf, sdm.Organizer))
-# Editor concept
-g.add((sdm.Editor,RDFS.subClassOf, sdm.Organizer))
-
-# Demo Paper concept 
-g.add((sdm.DemoPaper,RDFS.subClassOf, sdm.Paper))
-
-# Full Paper concept 
-g.add((sdm.FullPaper,RDFS.subClassOf, sdm.Paper))
-
-# Short Paper concept 
-g.add((sdm.ShortPaper,RDFS.subClassOf, sdm.Paper))
-
-# Poster concept 
-g.add((sdm.Poster,RDFS.subClassOf, sdm.Paper))
-
-# Proceeding concept 
-g.add((sdm.Proceeding,RDFS.subClassOf, sdm.Publication))
-
-# Volume concept 
-g.add((sdm.Volume,RDFS.subClassOf, sdm.Publication))
-
-# Journal concept 
-g.add((sdm.Journal,RDFS.subClassOf, sdm.Venue))
-
-# Conference concept 
-g.add((sdm.Conference,RDFS.subClassOf, sdm.Venue))
-
-# Workshop concept 
-g.add((sdm.Workshop,RDFS.subClassOf, sdm.Conference))
-
-# Regular Conference concept 
-g.add((sdm.RegularConference,RDFS.subClassOf, sdm.Conference))
-
-# Regular Conference concept 
-g.add((sdm.RegularConference,RDFS.subClassOf, sdm.Conference))
-
-# Synposium concept 
-g.add((sdm.Symposium,RDFS.subClassOf, sdm.Conference))
-
-# Expert Group concept 
-g.add((sdm.ExpertGroup,RDFS.subClassOf, sdm.Conference))
-
-
-#==============================================================================  PROPERTIES
-# Range is Author 
-# hasAuthor property
-g.add((sdm.hasAuthor,RDFS.domain, sdm.Paper))
-g.add((sdm.hasAuthor,RDFS.range, sdm.Author))
-
-# hasReviewer
-g.add((sdm.hasReviewer,RDFS.domain, sdm.Review))
-g.add((sdm.hasReviewer,RDFS.range, sdm.Author))
-
-# Range is Organizer 
-# assignedBy property 
-g.add((sdm.assignedBy,RDFS.domain, sdm.Submission))
-g.add((sdm.assignedBy,RDFS.range, sdm.Organizer))
-
-# hasOrganizer property 
-g.add((sdm.hasOrganizer,RDFS.domain, sdm.Venue))
-g.add((sdm.hasOrganizer,RDFS.range, sdm.Organizer))
-
-# Range is Review 
-# hasReview property
-g.add((sdm.hasReview,RDFS.domain, sdm.Submission))
-g.add((sdm.hasReview,RDFS.range, sdm.Review))
-
-# Range is Submission
-# includedIn property
-g.add((sdm.includedIn,RDFS.domain, sdm.Paper))
-g.add((sdm.includedIn,RDFS.range, sdm.Submission))
-
-# Range is Area 
-# paperRelatedTo property
-g.add((sdm.paperRelatedTo,RDFS.subPropertyOf, sdm.relatedTo))
-
-g.add((sdm.paperRelatedTo,RDFS.domain, sdm.Paper))
-g.add((sdm.paperRelatedTo,RDFS.range, sdm.Area))
-
-# Range is Venue
-# submittedTo property
-g.add((sdm.submittedTo,RDFS.domain, sdm.Submission))
-g.add((sdm.submittedTo,RDFS.range, sdm.Venue))
-
-# venueRelatedTo property
-g.add((sdm.venueRelatedTo,RDFS.subPropertyOf, sdm.relatedTo))
-
-g.add((sdm.venueRelatedTo,RDFS.domain, sdm.Venue))
-g.add((sdm.venueRelatedTo,RDFS.range, sdm.Area))
-
-# publicationRelatedTo property
-g.add((sdm.publicationRelatedTo,RDFS.subPropertyOf, sdm.relatedTo))
-
-g.add((sdm.publicationRelatedTo,RDFS.domain, sdm.Publication))
-g.add((sdm.publicationRelatedTo,RDFS.range, sdm.Area))
-
-# Range is Publication 
-# publishedIn property
-g.add((sdm.publishedIn,RDFS.domain, sdm.Paper))
-g.add((sdm.publishedIn,RDFS.range, sdm.Publication))
-
-# hasPublished property 
-g.add((sdm.hasPublished,RDFS.domain, sdm.Venue))
-g.add((sdm.hasPublished,RDFS.range, sdm.Publication))
-
-# Range is Proceeding 
-# posterPublishedIn property
-g.add((sdm.posterPublishedIn,RDFS.subPropertyOf, sdm.publishedIn))
-
-
-g.add((sdm.posterPublishedIn,RDFS.domain, sdm.Poster))
-g.add((sdm.posterPublishedIn,RDFS.range, sdm.Proceeding))
-
-#==============================================================================  DATA PROPERTIES
-
-## Person concept data properties
-## hasPersonName
-g.add((sdm.hasPersonName,RDFS.domain, sdm.Person))
-g.add((sdm.hasPersonName,RDFS.range, XSD.string))
-
-## hasBirthDate 
-g.add((sdm.hasBirthDate,RDFS.domain, sdm.Person))
-g.add((sdm.hasBirthDate,RDFS.range, XSD.date))
-
-## hasSex 
-g.add((sdm.hasSex,RDFS.domain, sdm.Person))
-g.add((sdm.hasSex,RDFS.range, XSD.string))
-
-## originCountry 
-g.add((sdm.originCountry,RDFS.domain, sdm.Person))
-g.add((sdm.originCountry,RDFS.range, XSD.string))
-
-## Author concept data properties 
-## hasHIndex 
-g.add((sdm.hasHIndex,RDFS.domain, sdm.Author))
-g.add((sdm.hasHIndex,RDFS.range, XSD.float))
-
-## url
-g.add((sdm.url,RDFS.domain, sdm.Author))
-g.add((sdm.url,RDFS.range, XSD.string))
-
-## affiliatedWithInstitution
-g.add((sdm.affiliatedWithInstitution,RDFS.domain, sdm.Author))
-g.add((sdm.affiliatedWithInstitution,RDFS.range, XSD.string))
-
-
-## Review concept data properties 
-## decision
-g.add((sdm.decision,RDFS.domain, sdm.Review))
-g.add((sdm.decision,RDFS.range, XSD.integer))
-
-## content 
-g.add((sdm.content,RDFS.domain, sdm.Review))
-g.add((sdm.content,RDFS.range, XSD.string))
-
-## reviewDate
-g.add((sdm.reviewDate,RDFS.domain, sdm.Review))
-g.add((sdm.reviewDate,RDFS.range, XSD.date))
-
-## Submission concept data properties 
-## submissionDate
-g.add((sdm.submissionDate,RDFS.domain, sdm.Submission))
-g.add((sdm.submissionDate,RDFS.range, XSD.date))
-
-## Venue concept data properties
-## hasVenueTitle
-g.add((sdm.hasVenueTitle,RDFS.domain, sdm.Venue))
-g.add((sdm.hasVenueTitle,RDFS.range, XSD.string))
-
-## Conference concept data properties 
-## conferenceSeries
-g.add((sdm.conferenceSeries,RDFS.domain, sdm.Conference))
-g.add((sdm.conferenceSeries,RDFS.range, XSD.string))
-
-## startDate
-g.add((sdm.startDate,RDFS.domain, sdm.Conference))
-g.add((sdm.startDate,RDFS.range, XSD.date))
-
-## endDate
-g.add((sdm.endDate,RDFS.domain, sdm.Conference))
-g.add((sdm.endDate,RDFS.range, XSD.date))
-
-## heldIn
-g.add((sdm.heldIn,RDFS.domain, sdm.Conference))
-g.add((sdm.heldIn,RDFS.range, XSD.string))
-
-## heldInYear
-g.add((sdm.heldInYear,RDFS.domain, sdm.Conference))
-g.add((sdm.heldInYear,RDFS.range, XSD.integer))
-
-## Publication concept data properties
-## publicationIssn
-g.add((sdm.publicationIssn,RDFS.domain, sdm.Publication))
-g.add((sdm.publicationIssn,RDFS.range, XSD.string))
-
-## publisher 
-g.add((sdm.publisher,RDFS.domain, sdm.Publication))
-g.add((sdm.publisher,RDFS.range, XSD.string))
-
-## publishedDate
-g.add((sdm.publishedDate,RDFS.domain, sdm.Publication))
-g.add((sdm.publishedDate,RDFS.range, XSD.date))
-
-## Paper concept data properties 
-## paperTitle
-g.add((sdm.paperTitle,RDFS.domain, sdm.Paper))
-g.add((sdm.paperTitle,RDFS.range, XSD.string))
-
-## paperWordCount
-g.add((sdm.paperWordCount,RDFS.domain, sdm.Paper))
-g.add((sdm.paperWordCount,RDFS.range, XSD.integer))
-
-## paperAbstract 
-g.add((sdm.paperAbstract,RDFS.domain, sdm.Paper))
-g.add((sdm.paperAbstract,RDFS.range, XSD.string))
-
-## paperDOI
-g.add((sdm.paperDOI,RDFS.domain, sdm.Paper))
-g.add((sdm.paperDOI,RDFS.range, XSD.string))
-
-## Area concept data properties 
-## hasTopicName
-g.add((sdm.hasTopicName,RDFS.domain, sdm.Area))
-g.add((sdm.hasTopicName,RDFS.range, XSD.string))
-
+tbox_to_rdf(g)
+# Statistics of the output: TBOX counted here, ABOX counted as it is emitted and the inferred
+# triples as the materializer adds them
+stats=Statistics.of(g)
 
 #=============================================================================# 
 #                                DEFINE ABOX                                  # 
 #=============================================================================# 
 
-#==============================================================================  FUNCTIONS
-def prepareValue(row, uri=sdm):
-    """
-    Function that prepares the values to be added to the graph as a URI or Literal
-    source: https://wiki.uib.no/info216/index.php/Python_Examples#RDF_programming_with_RDFlib_.28Lab_2.29
-    Input: row value 
-    Output: Converted URI or literal
-    """
-    if row == None:  # none type
-        value = Literal(row)
-    elif (isinstance(row, str) and re.match(r'\d{4}-\d{2}-\d{2}', row)) or isinstance(row, datetime):  # date
-        value = Literal(row, datatype=XSD.date)
-    elif isinstance(row, bool):  # boolean value (true / false)
-        value = Literal(row, datatype=XSD.boolean)
-    elif isinstance(row, int):  # integer
-        value = Literal(row, datatype=XSD.integer)
-    elif isinstance(row, str):  # string
-        value = Literal(row, datatype=XSD.string)
-    elif isinstance(row, float):  # float
-        value = Literal(row, datatype=XSD.float)
-    return value
-
-#==============================================================================  CLEAN ALL DATAFRAMES
-# General cLean up of all dfs
-df_list = [var for var in dir() if isinstance(eval(var), pd.core.frame.DataFrame)]
-for df in df_list:
-    print(df)
-    # replace nulls with None
-    globals()[df]=globals()[df].replace(np.nan, None)
-    
-    # Make all date columns into datetime
-    dcols=[i for i in globals()[df].columns if 'date' in i.lower() or i.endswith('_dt')]
-    for col in dcols:
-        globals()[df][col]=pd.to_datetime(globals()[df][col])
-        
-#==============================================================================  ABOX FUNCTIONS        
-# Convert the non-semantic CSV dataset into a semantic RDF
-def area_to_rdf(df):
-    """
-    Concepts: Area
-    """
-    for index, row in df.iterrows():
-        id = URIRef(sdm + "Area_" + str(row['area']))
-        name = prepareValue(row["topicName"])
-        
-        # Adds the triples
-#         g.add((id, RDF.type, sdm.Area))
-        g.add((id, sdm.hasTopicName, name))
-        
-    print('Done: Area')
-        
-def author_to_rdf(df):
-    """
-    Concepts: Person, Author
-    """
-    for index, row in df.iterrows():
-        # define values
-        #id = URIRef(sdm + "Person_" + str(row['author']))
-        id = URIRef(sdm + "Author_" + str(row['author']))
-        name = prepareValue(row["name"])
-        birthdate = prepareValue(row["birthdate"])
-        sex = prepareValue(row["sex"])
-        country = prepareValue(row["originCountry"])
-        
-        # Adds the triples
-#         g.add((id, RDF.type, sdm.Author))
-        g.add((id, sdm.hasPersonName, name))
-        g.add((id, sdm.hasBirthDate, birthdate))
-        g.add((id, sdm.hasSex, sex))
-        g.add((id, sdm.originCountry, country))
-        
-        # Author
-        #id = URIRef(sdm + "Author_" + str(row['author']))
-        url = prepareValue(row["url"])
-        hindex = prepareValue(row["hIndex"])
-        institution = prepareValue(row["institution"])
-                
-        # Adds the triples
-        g.add((id, sdm.url, url))
-        g.add((id, sdm.hasHIndex, hindex))
-        g.add((id, sdm.affiliatedWithInstitution, institution))
-    print('Done: Author')
-
-def conference_to_rdf(df):
-    """
-    Concepts: Conference
-    Relationships: hasOrganizer
-    """
-    for index, row in df.iterrows():
-        # define values
-        id = URIRef(sdm + "Conference_" + str(row['conference']))
-        conf_type={'expert group':sdm.ExpertGroup, 'symposium':sdm.Symposium, 
-                   'workshop':sdm.Workshop, 'regular':sdm.RegularConference}[row['type']]
-        title = prepareValue(row["title"])
-        location = prepareValue(row["location"])
-        start = prepareValue(row["Start"])
-        end = prepareValue(row["End"])
-        year = prepareValue(row["year"])
-        conferenceSeries = prepareValue(row["conferenceSeries"])
-        
-        # Adds the triples 
-        g.add((id, RDF.type, conf_type))
-        g.add((id, sdm.hasVenueTitle, title))
-        g.add((id, sdm.heldIn, location))
-        g.add((id, sdm.startDate, start))
-        g.add((id, sdm.endDate, end))
-        g.add((id, sdm.heldInYear, year))
-        g.add((id, sdm.conferenceSeries, conferenceSeries))
-        
-        # Relationships
-        author_org=URIRef(sdm + "Author_" + str(row['organizer']))
-        #author_org=URIRef(sdm + str(row['organizer']))
-        
-        # Adds the triples
-        g.add((author_org, RDF.type, sdm.Chair))
-        g.add((id, sdm.hasOrganizer, author_org))
-    print('Done: Conference')
-        
-def journal_to_rdf(df):
-    """
-    Concepts: Journal
-    Relationships: hasOrganizer
-    """
-    for index, row in df.iterrows():
-        # define values
-        id = URIRef(sdm + "Journal_" + str(row['journal']))
-        title = prepareValue(row["title"])
-        
-        # Adds the triples 
-        g.add((id, RDF.type, sdm.Journal))
-        g.add((id, sdm.hasVenueTitle, title))
-        
-        # Relationships
-        author_org=URIRef(sdm + "Author_" + str(row['organizer']))
-        #author_org=URIRef(sdm + str(row['organizer']))
-
-        
-        # Adds the triples
-        g.add((author_org, RDF.type, sdm.Editor))
-        g.add((id, sdm.hasOrganizer, author_org))
-    print('Done: Journal')
-
-def volume_to_rdf(df):
-    """
-    Concepts: Volume
-    Relationships: hasPublished
-    NOTE: Used Venue > Publication relationship. note that Volume URIs replace spaces with _
-    """
-    for index, row in df.iterrows():
-        # define values
-        id = URIRef(sdm + "Volume_" + str(row['volume']).replace(' ','_'))
-        jid= URIRef(sdm + "Journal_" + str(row['journal']))
-        issn = prepareValue(row["issn"])
-        published_date = prepareValue(row["published_date"])
-        publisher = prepareValue(row["publisher"])
-        
-        # Adds the triples
-        g.add((id, RDF.type, sdm.Volume))
-        g.add((id, sdm.publicationIssn, issn))
-        g.add((id, sdm.publishedDate, published_date))
-        g.add((id, sdm.publisher, publisher))
-        
-        # Relationship
-        g.add((jid, sdm.hasPublished, id))
-    print('Done: Volume')
-
-def proceeding_to_rdf(df):
-    """
-    Concepts: proceeding
-    Relationships: hasPublished
-    NOTE: Used Venue > Publication relationship
-    """
-    for index, row in df.iterrows():
-        # define values
-        id = URIRef(sdm + "Proceeding_" + str(row['proceeding']))
-        cid= URIRef(sdm + "Conference_" + str(row['conference']))
-        issn = prepareValue(row["issn"])
-        published_date = prepareValue(row["published_date"])
-        publisher = prepareValue(row["publisher"])
-        
-        # Adds the triples
-        g.add((id, RDF.type, sdm.Proceeding)) 
-        g.add((id, sdm.publicationIssn, issn))
-        g.add((id, sdm.publishedDate, published_date))
-        g.add((id, sdm.publisher, publisher))
-        
-        # Relationship
-        g.add((cid, sdm.hasPublished, id))
-    print('Done: Proceeding')
-
-def paper_to_rdf(df):
-    """
-    Concepts: Paper, Submission
-    Relationships: includedIn, publishedIn, assignedBy, submittedTo
-    """
-    for index, row in df.iterrows():
-        # define values
-        id = URIRef(sdm + "Paper_" + str(row['paper']))
-        sid = URIRef(sdm + "Submission_" + str(row['submission']))
-        oid=URIRef(sdm + 'Author_' + str(row['organizer']))
-        vid=URIRef(sdm + row['venue_type']+'_' + str(row['venue']))
-        paper_type={'demo':sdm.DemoPaper, 'full':sdm.FullPaper, 'short':sdm.ShortPaper, 'poster':sdm.Poster}[row['type']]
-        
-        for col in df.columns:
-            locals()[col]=prepareValue(row[col])
-            
-        # Paper properties
-        g.add((id,RDF.type, paper_type))
-        g.add((id,sdm.paperAbstract, locals()['abstract']))
-        g.add((id,sdm.paperTitle, locals()['title']))
-        g.add((id,sdm.paperWordCount, locals()['wordcount']))
-
-        # Submission properties
-        g.add((sid,sdm.submissionDate, locals()['submitted_date']))
-
-        # Relationships
-        g.add((id,sdm.includedIn,sid))
-        g.add((sid, sdm.assignedBy, oid))
-        g.add((sid, sdm.submittedTo, vid))
-        
-        # Conditional property and relationship, only add if paper decision is true (published)
-        if row['decision']:
-            pid=URIRef(sdm + {'Conference':'Proceeding_','Journal':'Volume_'}[row['venue_type']] + str(row['publication']).replace(' ','_'))
-            g.add((id,sdm.paperDOI, locals()['doi']))
-            if row['type']!='poster':
-                g.add((id,sdm.publishedIn,pid))
-            else:
-                g.add((id,sdm.posterPublishedIn,pid))
-    print('Done: Paper')
-
-def review_to_rdf(df):
-    """
-    Concepts: Review
-    Relationships: hasReviewer, hasReview
-    """
-    for index, row in df.iterrows():
-        # define values
-        id = URIRef(sdm + "Review_" + str(row['review']))
-        sid = URIRef(sdm + "Submission_" + str(row['submission']))
-        rid=URIRef(sdm + 'Author_' + str(row['reviewer']))
-        #rid=URIRef(sdm + str(row['reviewer']))
-        
-        for col in df.columns:
-            locals()[col]=prepareValue(row[col])
-            
-        # Paper properties
-        g.add((id,sdm.decision, locals()['decision']))
-        g.add((id,sdm.content, locals()['content']))
-        g.add((id,sdm.reviewDate, locals()['reviewDate']))
-
-        # Relationships
-        g.add((id,sdm.hasReviewer,rid))
-        g.add((sid, sdm.hasReview, id))
-    print('Done: Review')
-        
-def hasauthor_to_rdf(df):
-    """
-    Relationships: hasAuthor
-    """
-    for index, row in df.iterrows():
-        # define values
-        pid = URIRef(sdm + "Paper_" + str(row['paper']))
-        aid = URIRef(sdm + "Author_" + str(row['author']))
-        #aid = URIRef(sdm + str(row['author']))
-
-        # Relationships
-        g.add((pid,sdm.hasAuthor,aid))
-    print('Done: hasAuthor')
-        
-def hastopic_to_rdf(df):
-    """
-    Relationships: paperRelatedTo, venueRelatedTo, publicationRelatedTo
-    """
-    for index, row in df.iterrows():
-        # define values
-        pid = URIRef(sdm + to_camel_case(row['typ'])+'_' + str(row['id']).replace(' ','_'))
-        aid = URIRef(sdm + "Area_" + str(row['area']))
-        rel={'paper':sdm.paperRelatedTo, 'journal':sdm.venueRelatedTo, 'volume':sdm.publicationRelatedTo, 
-             'conference':sdm.venueRelatedTo, 'proceeding':sdm.publicationRelatedTo}[row['typ']]
-
-        # Relationships
-        g.add((pid,rel,aid))
-        
-    print('Done: hasTopic')
-    
 #==============================================================================  IMPLEMENTATION
-# Call functions
-area_to_rdf(area)
-author_to_rdf(author)
-conference_to_rdf(conference)
-journal_to_rdf(journal)
-volume_to_rdf(volume)
-proceeding_to_rdf(proceeding)
-paper_to_rdf(paper) 
-review_to_rdf(review) 
-hasauthor_to_rdf(hasAuthor)
-hastopic_to_rdf(hasTopic)
+# Converters and their dataframes
+converters=[(area_to_rdf, frames['area'], {}),
+            (author_to_rdf, frames['author'], {}),
+            (conference_to_rdf, frames['conference'], {'links':True}),
+            (journal_to_rdf, frames['journal'], {'links':True}),
+            (volume_to_rdf, frames['volume'], {'links':True}),
+            (proceeding_to_rdf, frames['proceeding'], {'links':True}),
+            (paper_to_rdf, frames['paper'], {'links':True}),
+            (review_to_rdf, frames['review'], {}),
+            (hasauthor_to_rdf, frames['hasAuthor'], {}),
+            (hastopic_to_rdf, frames['hasTopic'], {})]
+
+# Call functions, or only compare the changed rows with the previous incremental run
+delta=incremental and has_manifest(savefolder, CLOSURE_MANIFEST)
+if delta:
+    insert, delete = changes(savefolder, converters, CLOSURE_MANIFEST)
+else:
+    with collect(stats):
+        for converter, frame, kwargs in converters:
+            converter(g, frame, **kwargs)
 
 # Get total counts
 for df in df_list:
-    cols=globals()[df].columns
+    cols=frames[df].columns
     if df in cols:
-        print(f'{df}: {globals()[df][df].nunique()}')
+        print(f'{df}: {frames[df][df].nunique()}')
     if 'type' in cols:
-        print(f'{df} types:\n', globals()[df]['type'].value_counts().to_frame(),'\n')
+        print(f'{df} types:\n', frames[df]['type'].value_counts().to_frame(),'\n')
     if 'organizer' in cols:
-        print(f'{df} organizer: {globals()[df]["organizer"].nunique()}')
-print('Total unique organizers:',pd.concat([conference['organizer'], journal['organizer']]).nunique())
+        print(f'{df} organizer: {frames[df]["organizer"].nunique()}')
+print('Total unique organizers:',pd.concat([frames['conference']['organizer'], frames['journal']['organizer']]).nunique())
+print('Term pool:', pool.stats())
 
 #=============================================================================# 
 #                               EXPORT GRAPH                                  # 
@@ -865,7 +145,27 @@ print('Total unique organizers:',pd.concat([conference['organizer'], journal['or
 os.chdir(savefolder)
 
 # serialize with inference
-engine = owlrl.RDFSClosure.RDFS_Semantics(g,False,False,False)
-engine.closure()
-engine.flush_stored_triples()
-g.serialize(destination='output_graph_inference.rdf',format="xml")
\ No newline at end of file
+if delta:
+    closure=load_closure('.')
+    added, removed = closure.update(insert, delete)
+    print('Triples to add and delete:', write_changes('.', 'output_graph_inference', added, removed, compress))
+elif reasoner=='owlrl':
+    engine = owlrl.RDFSClosure.RDFS_Semantics(g,False,False,False)
+    engine.closure()
+    engine.flush_stored_triples()
+    # owlrl adds its triples to g directly, so the closed graph is counted again
+    stats=Statistics.of(g)
+elif incremental:
+    closure=Closure(g)
+    with collect(stats):
+        print('Inferred triples:', closure.materialize(g))
+else:
+    with collect(stats):
+        print('Inferred triples:', materialize(g, profile=profile, verbose=True))
+if not delta:
+    export(g, 'output_graph_inference', output_format, compress, max_bytes)
+    # Cardinalities of the written graph for the query optimizer (optimize.py)
+    save_statistics(stats, 'output_graph_inference')
+if incremental:
+    save_manifest('.', converters, CLOSURE_MANIFEST)
+    save_closure('.', closure)
\ No newline at end of file
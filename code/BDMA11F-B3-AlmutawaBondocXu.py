@@ -2,7 +2,7 @@
 """
 Code to create rdf:type links from ABOX to TBOX
 Input: 
-    interim parquet files from run of B2 code
+    interim files from run of B2 code (uncompressed Feather, or pickle without pyarrow)
     save path
 Output: rdf file of ABOX links (output_link.rdf)
 """
@@ -10,21 +10,30 @@ Output: rdf file of ABOX links (output_link.rdf)
 #                              PRELIMINARIES                                  # 
 #=============================================================================# 
 
-import pandas as pd
 import os
-from rdflib import Graph, Namespace, URIRef, RDF, XSD, RDFS
+from rdflib import Graph, Namespace, RDF, XSD, RDFS
+from export import export
+from stats import Statistics, collect, save_statistics
+from options import parse_args
+from abox import (link_conference_to_rdf, link_journal_to_rdf, link_volume_to_rdf,
+                  link_proceeding_to_rdf, link_paper_to_rdf)
+from ingest import read_interim
 
 # Folder to save all output
 savefolder='../output'
 
+# Output format (--format xml|turtle|nt|nquads), compression (--compress gzip|zstd) and
+# maximum size of the N-Triples/N-Quads files (--max-bytes)
+args=parse_args()
+output_format, compress, max_bytes = args.format, args.compress, args.max_bytes
+
 os.chdir(savefolder)
 
 #=============================================================================# 
 #                                READ DATA                                    # 
 #=============================================================================# 
 
-for df in ['conference','journal','volume','proceeding','paper']:
-    globals()[df]=pd.read_pickle(f"interim_{df}.pkl")
+frames={df: read_interim(df) for df in ['conference','journal','volume','proceeding','paper']}
 
 #=============================================================================# 
 #                               DEFINE GRAPH                                  # 
@@ -50,77 +59,24 @@ NS = {
 #                                DEFINE LINKS                                 # 
 #=============================================================================# 
 
-def link_conference_to_rdf(df):
-    """
-    Concepts: Conference type, Chair
-    """
-    for index, row in df.iterrows():
-        id = URIRef(sdm + "Conference_" + str(row['conference']))
-        author_org=URIRef(sdm + "Author_" + str(row['organizer']))
-        conf_type={'expert group':sdm.ExpertGroup, 'symposium':sdm.Symposium, 
-                   'workshop':sdm.Workshop, 'regular':sdm.RegularConference}[row['type']]
-        g.add((id, RDF.type, conf_type))
-        g.add((author_org, RDF.type, sdm.Chair))
-        
-    print('Link done: Conference')
-
-def link_journal_to_rdf(df):
-    """
-    Concepts: Journal, Editor
-    """
-    for index, row in df.iterrows():
-        id = URIRef(sdm + "Journal_" + str(row['journal']))
-        author_org=URIRef(sdm + "Author_" + str(row['organizer']))
-        g.add((id, RDF.type, sdm.Journal))
-        g.add((author_org, RDF.type, sdm.Editor))
-        
-    print('Link done: Journal')
-
-def link_volume_to_rdf(df):
-    """
-    Concepts: Volume
-    """
-    for index, row in df.iterrows():
-        id = URIRef(sdm + "Volume_" + str(row['volume']).replace(' ','_'))
-        g.add((id, RDF.type, sdm.Volume))
-
-    print('Link done: Volume')
-    
-def link_proceeding_to_rdf(df):
-    """
-    Concepts: Proceeding
-    """
-    for index, row in df.iterrows():
-        id = URIRef(sdm + "Proceeding_" + str(row['proceeding']))
-        g.add((id, RDF.type, sdm.Proceeding)) 
-
-    print('Link done: Proceeding')
-        
-def link_paper_to_rdf(df):
-    """
-    Concepts: Paper type
-    """
-    for index, row in df.iterrows():
-        id = URIRef(sdm + "Paper_" + str(row['paper']))
-        paper_type={'demo':sdm.DemoPaper, 'full':sdm.FullPaper, 'short':sdm.ShortPaper, 'poster':sdm.Poster}[row['type']]
-        g.add((id,RDF.type, paper_type))
-
-    print('Link done: Paper')
-        
+# Link mappings are defined in abox.py (CONFERENCE_LINKS, JOURNAL_LINKS, ...)
+
 #==============================================================================  IMPLEMENTATION
 
 print("/=============================/")
 print('/       GENERATE LINKS        /')
 print("/=============================/")
 
-# Call functions
-link_conference_to_rdf(conference)
-link_journal_to_rdf(journal)
-link_volume_to_rdf(volume)
-link_proceeding_to_rdf(proceeding)
-link_paper_to_rdf(paper)
+# Call functions, counting the triples for the statistics of the output
+with collect(Statistics()) as stats:
+    link_conference_to_rdf(g, frames['conference'])
+    link_journal_to_rdf(g, frames['journal'])
+    link_volume_to_rdf(g, frames['volume'])
+    link_proceeding_to_rdf(g, frames['proceeding'])
+    link_paper_to_rdf(g, frames['paper'])
 
 #=============================================================================# 
 #                                EXPORT LINK                                  # 
 #=============================================================================# 
-g.serialize(destination='output_link.rdf',format="xml")
\ No newline at end of file
+export(g, 'output_link', output_format, compress, max_bytes)
+save_statistics(stats, 'output_link')
\ No newline at end of file
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""
+ABOX converters shared by the B, B2, B2-B3 and B3 scripts.
+Each converter is a declarative mapping from dataframe columns to predicates
+which is emitted column-at-a-time by triples.emit.
+Input: prepared dataframes (see PREPARE DATA in the scripts)
+Output: triples added to the graph passed as first argument
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+from rdflib import RDF
+from triples import sdm, emit, ref, lit, mapped, properties, columns
+from tbox import datatypes
+
+#=============================================================================#
+#                                 MAPPINGS                                    #
+#=============================================================================#
+
+CONFERENCE_TYPES={'expert group':sdm.ExpertGroup, 'symposium':sdm.Symposium,
+                  'workshop':sdm.Workshop, 'regular':sdm.RegularConference}
+PAPER_TYPES={'demo':sdm.DemoPaper, 'full':sdm.FullPaper, 'short':sdm.ShortPaper, 'poster':sdm.Poster}
+TOPIC_PREFIXES={'paper':'Paper_', 'journal':'Journal_', 'volume':'Volume_',
+                'conference':'Conference_', 'proceeding':'Proceeding_'}
+TOPIC_RELATIONS={'paper':sdm.paperRelatedTo, 'journal':sdm.venueRelatedTo, 'volume':sdm.publicationRelatedTo,
+                 'conference':sdm.venueRelatedTo, 'proceeding':sdm.publicationRelatedTo}
+
+# Literals are typed with the RDFS.range of their property in the TBOX
+DATATYPES=datatypes()
+
+#==============================================================================  SUBJECTS
+AREA_ID=ref('Area_', 'area')
+AUTHOR_ID=ref('Author_', 'author')
+ORGANIZER_ID=ref('Author_', 'organizer')
+REVIEWER_ID=ref('Author_', 'reviewer')
+CONFERENCE_ID=ref('Conference_', 'conference')
+JOURNAL_ID=ref('Journal_', 'journal')
+VOLUME_ID=ref('Volume_', 'volume', spaces=True)
+PROCEEDING_ID=ref('Proceeding_', 'proceeding')
+PAPER_ID=ref('Paper_', 'paper')
+SUBMISSION_ID=ref('Submission_', 'submission')
+REVIEW_ID=ref('Review_', 'review')
+VENUE_ID=ref(('venue_type', {'Conference':'Conference_', 'Journal':'Journal_'}), 'venue')
+PUBLICATION_ID=ref(('venue_type', {'Conference':'Proceeding_', 'Journal':'Volume_'}), 'publication', spaces=True)
+TOPIC_ID=ref(('typ', TOPIC_PREFIXES), 'id', spaces=True)
+
+#==============================================================================  CONDITIONS
+def published(df):
+    'Papers with a positive decision'
+    return df['decision'].fillna(False).astype(bool)
+
+def poster(df):
+    'Published posters'
+    return published(df)&(df['type']=='poster')
+
+def not_poster(df):
+    'Published papers other than posters'
+    return published(df)&(df['type']!='poster')
+
+#==============================================================================  ABOX
+AREA=properties(AREA_ID, {sdm.hasTopicName:'topicName'}, DATATYPES)
+
+AUTHOR=properties(AUTHOR_ID, {
+    # Person
+    sdm.hasPersonName:'name',
+    sdm.hasBirthDate:'birthdate',
+    sdm.hasSex:'sex',
+    sdm.originCountry:'originCountry',
+    # Author
+    sdm.url:'url',
+    sdm.hasHIndex:'hIndex',
+    sdm.affiliatedWithInstitution:'institution',
+}, DATATYPES)
+
+CONFERENCE=properties(CONFERENCE_ID, {
+    sdm.hasVenueTitle:'title',
+    sdm.heldIn:'location',
+    sdm.startDate:'Start',
+    sdm.endDate:'End',
+    sdm.heldInYear:'year',
+    sdm.conferenceSeries:'conferenceSeries',
+}, DATATYPES)+[
+    (CONFERENCE_ID, sdm.hasOrganizer, ORGANIZER_ID),
+]
+
+JOURNAL=properties(JOURNAL_ID, {sdm.hasVenueTitle:'title'}, DATATYPES)+[
+    (JOURNAL_ID, sdm.hasOrganizer, ORGANIZER_ID),
+]
+
+VOLUME=properties(VOLUME_ID, {
+    sdm.publicationIssn:'issn',
+    sdm.publishedDate:'published_date',
+    sdm.publisher:'publisher',
+}, DATATYPES)+[
+    (JOURNAL_ID, sdm.hasPublished, VOLUME_ID),
+]
+
+PROCEEDING=properties(PROCEEDING_ID, {
+    sdm.publicationIssn:'issn',
+    sdm.publishedDate:'published_date',
+    sdm.publisher:'publisher',
+}, DATATYPES)+[
+    (CONFERENCE_ID, sdm.hasPublished, PROCEEDING_ID),
+]
+
+PAPER=properties(PAPER_ID, {
+    sdm.paperAbstract:'abstract',
+    sdm.paperTitle:'title',
+    sdm.paperWordCount:'wordcount',
+}, DATATYPES)+properties(SUBMISSION_ID, {
+    sdm.submissionDate:'submitted_date',
+}, DATATYPES)+[
+    (PAPER_ID, sdm.includedIn, SUBMISSION_ID),
+    (SUBMISSION_ID, sdm.assignedBy, ORGANIZER_ID),
+    (SUBMISSION_ID, sdm.submittedTo, VENUE_ID),
+    # Conditional property and relationship, only add if paper decision is true (published)
+    (PAPER_ID, sdm.paperDOI, lit('doi', DATATYPES[sdm.paperDOI]), published),
+    (PAPER_ID, sdm.publishedIn, PUBLICATION_ID, not_poster),
+    (PAPER_ID, sdm.posterPublishedIn, PUBLICATION_ID, poster),
+]
+
+REVIEW=properties(REVIEW_ID, {
+    sdm.decision:'decision',
+    sdm.content:'content',
+    sdm.reviewDate:'reviewDate',
+}, DATATYPES)+[
+    (REVIEW_ID, sdm.hasReviewer, REVIEWER_ID),
+    (SUBMISSION_ID, sdm.hasReview, REVIEW_ID),
+]
+
+HASAUTHOR=[(PAPER_ID, sdm.hasAuthor, AUTHOR_ID)]
+
+HASTOPIC=[(TOPIC_ID, mapped('typ', TOPIC_RELATIONS), AREA_ID)]
+
+#==============================================================================  LINKS
+CONFERENCE_LINKS=[
+    (CONFERENCE_ID, RDF.type, mapped('type', CONFERENCE_TYPES)),
+    (ORGANIZER_ID, RDF.type, sdm.Chair),
+]
+
+JOURNAL_LINKS=[
+    (JOURNAL_ID, RDF.type, sdm.Journal),
+    (ORGANIZER_ID, RDF.type, sdm.Editor),
+]
+
+VOLUME_LINKS=[(VOLUME_ID, RDF.type, sdm.Volume)]
+
+PROCEEDING_LINKS=[(PROCEEDING_ID, RDF.type, sdm.Proceeding)]
+
+PAPER_LINKS=[(PAPER_ID, RDF.type, mapped('type', PAPER_TYPES))]
+
+LINKS={'conference':CONFERENCE_LINKS, 'journal':JOURNAL_LINKS, 'volume':VOLUME_LINKS,
+       'proceeding':PROCEEDING_LINKS, 'paper':PAPER_LINKS}
+
+# Columns B3 needs from the interim data of B2
+LINK_COLUMNS={name: columns(triples) for name, triples in LINKS.items()}
+
+#=============================================================================#
+#                                CONVERTERS                                   #
+#=============================================================================#
+
+#==============================================================================  ABOX FUNCTIONS
+# Convert the non-semantic CSV dataset into a semantic RDF.
+# links=True also adds the rdf:type links (B and B2-B3), otherwise they are generated by B3
+def area_to_rdf(g, df):
+    """
+    Concepts: Area
+    """
+    emit(g, df, AREA)
+    print('Done: Area')
+
+def author_to_rdf(g, df):
+    """
+    Concepts: Person, Author
+    """
+    emit(g, df, AUTHOR)
+    print('Done: Author')
+
+def conference_to_rdf(g, df, links=False):
+    """
+    Concepts: Conference
+    Relationships: hasOrganizer
+    """
+    emit(g, df, CONFERENCE+(CONFERENCE_LINKS if links else []))
+    print('Done: Conference')
+
+def journal_to_rdf(g, df, links=False):
+    """
+    Concepts: Journal
+    Relationships: hasOrganizer
+    """
+    emit(g, df, JOURNAL+(JOURNAL_LINKS if links else []))
+    print('Done: Journal')
+
+def volume_to_rdf(g, df, links=False):
+    """
+    Concepts: Volume
+    Relationships: hasPublished
+    NOTE: Used Venue > Publication relationship. note that Volume URIs replace spaces with _
+    """
+    emit(g, df, VOLUME+(VOLUME_LINKS if links else []))
+    print('Done: Volume')
+
+def proceeding_to_rdf(g, df, links=False):
+    """
+    Concepts: proceeding
+    Relationships: hasPublished
+    NOTE: Used Venue > Publication relationship
+    """
+    emit(g, df, PROCEEDING+(PROCEEDING_LINKS if links else []))
+    print('Done: Proceeding')
+
+def paper_to_rdf(g, df, links=False):
+    """
+    Concepts: Paper, Submission
+    Relationships: includedIn, publishedIn, assignedBy, submittedTo
+    """
+    emit(g, df, PAPER+(PAPER_LINKS if links else []))
+    print('Done: Paper')
+
+def review_to_rdf(g, df):
+    """
+    Concepts: Review
+    Relationships: hasReviewer, hasReview
+    """
+    emit(g, df, REVIEW)
+    print('Done: Review')
+
+def hasauthor_to_rdf(g, df):
+    """
+    Relationships: hasAuthor
+    """
+    emit(g, df, HASAUTHOR)
+    print('Done: hasAuthor')
+
+def hastopic_to_rdf(g, df):
+    """
+    Relationships: paperRelatedTo, venueRelatedTo, publicationRelatedTo
+    """
+    emit(g, df, HASTOPIC)
+    print('Done: hasTopic')
+
+#==============================================================================  LINK FUNCTIONS
+def link_conference_to_rdf(g, df):
+    """
+    Concepts: Conference type, Chair
+    """
+    emit(g, df, CONFERENCE_LINKS)
+    print('Link done: Conference')
+
+def link_journal_to_rdf(g, df):
+    """
+    Concepts: Journal, Editor
+    """
+    emit(g, df, JOURNAL_LINKS)
+    print('Link done: Journal')
+
+def link_volume_to_rdf(g, df):
+    """
+    Concepts: Volume
+    """
+    emit(g, df, VOLUME_LINKS)
+    print('Link done: Volume')
+
+def link_proceeding_to_rdf(g, df):
+    """
+    Concepts: Proceeding
+    """
+    emit(g, df, PROCEEDING_LINKS)
+    print('Link done: Proceeding')
+
+def link_paper_to_rdf(g, df):
+    """
+    Concepts: Paper type
+    """
+    emit(g, df, PAPER_LINKS)
+    print('Link done: Paper')
+
+#==============================================================================  SPECS PER CONVERTER
+CONVERTER_TRIPLES={area_to_rdf:AREA, author_to_rdf:AUTHOR, conference_to_rdf:CONFERENCE, journal_to_rdf:JOURNAL,
+                   volume_to_rdf:VOLUME, proceeding_to_rdf:PROCEEDING, paper_to_rdf:PAPER, review_to_rdf:REVIEW,
+                   hasauthor_to_rdf:HASAUTHOR, hastopic_to_rdf:HASTOPIC}
+CONVERTER_LINKS={conference_to_rdf:CONFERENCE_LINKS, journal_to_rdf:JOURNAL_LINKS, volume_to_rdf:VOLUME_LINKS,
+                 proceeding_to_rdf:PROCEEDING_LINKS, paper_to_rdf:PAPER_LINKS}
+
+def converter_triples(converter, links=False):
+    """
+    Triple specs emitted by a converter
+    Input: converter function, links argument of the converter
+    Output: list of triple specs
+    """
+    return CONVERTER_TRIPLES[converter]+(CONVERTER_LINKS.get(converter, []) if links else [])
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the output formats.
+Writes the same graph (the triples of a synthetic reviews table) in every format and
+compression supported by export.py and reports the write time and the file size.
+Input: number of reviews (default 50000, 5 triples each), e.g. python bench_formats.py 200000
+Output: table printed to the console
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+import os, sys, time, tempfile
+import numpy as np
+import pandas as pd
+from rdflib import Graph
+from abox import review_to_rdf
+from export import export, LINE_FORMATS
+from triples import zstandard
+
+n=int(sys.argv[1]) if len(sys.argv)>1 else 50000
+rng=np.random.default_rng(123)
+
+#=============================================================================#
+#                                  DATA                                       #
+#=============================================================================#
+
+review=pd.DataFrame({'review':[f'{i}-{j}' for i, j in zip(range(n), rng.integers(0, 5000, n))],
+                     'submission':'sub-'+pd.Series(rng.integers(0, n//2+1, n)).astype(str),
+                     'reviewer':rng.integers(0, 20000, n),
+                     'decision':rng.integers(0, 2, n),
+                     'content':'review text '+pd.Series(rng.integers(0, 1000, n)).astype(str),
+                     'reviewDate':pd.Timestamp('2019-01-01')+pd.to_timedelta(rng.integers(0, 900, n), unit='D')})
+g=Graph()
+review_to_rdf(g, review)
+
+#=============================================================================#
+#                                BENCHMARK                                    #
+#=============================================================================#
+
+rows=[]
+compressions=[None, 'gzip']+(['zstd'] if zstandard is not None else [])
+with tempfile.TemporaryDirectory() as folder:
+    os.chdir(folder)
+    for output_format in ['xml', 'turtle', 'nt', 'nquads']:
+        for compress in compressions:
+            start=time.perf_counter()
+            paths=export(g, 'output_bench', output_format, compress)
+            seconds=time.perf_counter()-start
+            size=sum(os.path.getsize(p) for p in paths)
+            rows.append((output_format, compress or '-', seconds, size/1e6))
+            for p in paths:
+                os.remove(p)
+    os.chdir('/')
+
+print(f'\nTriples: {len(g)}' + ('' if zstandard is not None else ' (zstandard not installed: no zstd rows)'))
+print(f'{"format":8} {"compress":8} {"write (s)":>10} {"size (MB)":>10}')
+for output_format, compress, seconds, size in rows:
+    print(f'{output_format:8} {compress:8} {seconds:10.2f} {size:10.2f}')
+print(f'Line formats ({", ".join(LINE_FORMATS)}) can also be split with --max-bytes')
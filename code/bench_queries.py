@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the queries of ../query on the generated outputs, without GraphDB.
+Every layout of workload.py whose outputs are in the folder is loaded into an rdflib graph,
+and every query is run after a warmup. The load time, the number of answers and the p50
+and p95 latencies are reported per layout.
+Input: folder with the outputs (default ../output), timed runs (default 20) and warmup runs
+       (default 3) per query, e.g. python bench_queries.py ../output 50 5
+Output: table printed to the console
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+import sys
+from workload import queries, available, load_layout, percentiles, timed
+
+folder=sys.argv[1] if len(sys.argv)>1 else '../output'
+runs=int(sys.argv[2]) if len(sys.argv)>2 else 20
+warmup=int(sys.argv[3]) if len(sys.argv)>3 else 3
+
+#=============================================================================#
+#                                BENCHMARK                                    #
+#=============================================================================#
+
+workload=queries()
+layouts=available(folder)
+if not layouts:
+    sys.exit(f'No outputs in {folder}: run B, or B1 with B2-B3 (or B2 and B3), first')
+
+rows=[]
+for layout in layouts:
+    g, prepare, seconds = load_layout(folder, layout)
+    print(f'{layout}: {len(g)} triples loaded in {seconds:.2f} s')
+    for name, text in workload.items():
+        times, n = timed(g, prepare(text), runs, warmup)
+        rows.append((layout, name, n, *percentiles(times)))
+
+print(f'\n{"layout":13} {"query":13} {"answers":>8} {"p50 (ms)":>9} {"p95 (ms)":>9}')
+for layout, name, n, p50, p95 in rows:
+    print(f'{layout:13} {name:13} {n:8} {p50:9.2f} {p95:9.2f}')
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the BGP reordering of optimize.py.
+The materialized graph of B is replicated to make a large graph: the ABOX nodes and string
+literals of every copy get a suffix, so each name or topic stays as selective as in the
+original graph. The queries of ../query are run with rdflib's pattern order and with the
+order of the optimizer and the p50 latency is reported.
+Input: folder with output_graph_inference and output_tbox (default ../output), number of
+       copies (default 50) and timed runs (default 5), e.g. python bench_reorder.py ../output 200
+Output: table printed to the console
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+import sys, time
+from rdflib import Graph, Literal, URIRef, XSD
+from export import load_output
+from optimize import Optimizer
+from stats import Statistics
+from workload import queries, percentiles, timed
+
+folder=sys.argv[1] if len(sys.argv)>1 else '../output'
+copies=int(sys.argv[2]) if len(sys.argv)>2 else 50
+runs=int(sys.argv[3]) if len(sys.argv)>3 else 5
+
+#=============================================================================#
+#                                  DATA                                       #
+#=============================================================================#
+
+source, tbox = Graph(), Graph()
+load_output(source, folder, 'output_graph_inference')
+load_output(tbox, folder, 'output_tbox')
+schema=set(term for triple in tbox for term in triple)
+
+def copy(term, i):
+    'Term of the i-th copy of the graph'
+    if i==0 or term in schema:
+        return term
+    if isinstance(term, URIRef):
+        return URIRef(f'{term}-{i}') if term.startswith('http://example.org/sdm#') else term
+    if isinstance(term, Literal) and term.datatype==XSD.string:
+        return Literal(f'{term} {i}', datatype=XSD.string)
+    return term
+
+start=time.perf_counter()
+g=Graph()
+for i in range(copies):
+    g.addN((copy(s, i), copy(p, i), copy(o, i), g) for s, p, o in source)
+stats=Statistics.of(g)
+print(f'{copies} copies: {len(g)} triples ({time.perf_counter()-start:.1f} s)')
+optimizer=Optimizer(stats)
+
+#=============================================================================#
+#                                BENCHMARK                                    #
+#=============================================================================#
+
+print(f'\n{"query":13} {"answers":>8} {"rdflib (ms)":>12} {"reordered (ms)":>15}')
+for name, text in queries().items():
+    before, n = timed(g, optimizer.optimize(text, reorder=False), runs, 1)
+    after, n_after = timed(g, optimizer.optimize(text), runs, 1)
+    assert n==n_after, name
+    print(f'{name:13} {n:8} {percentiles(before)[0]:12.2f} {percentiles(after)[0]:15.2f}')
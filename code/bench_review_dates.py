@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the review date sampling.
+Compares the previous per-row fake.date_between_dates inside iterrows() with the bulk
+sampler synth.dates_between on a synthetic reviews table.
+Input: number of reviews (default 200000), e.g. python bench_review_dates.py 1000000
+Output: timings printed to the console
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+import sys, time
+import numpy as np
+import pandas as pd
+from faker import Faker
+from synth import dates_between
+
+n=int(sys.argv[1]) if len(sys.argv)>1 else 200000
+# The row loop is timed on a sample and extrapolated
+sample_size=min(n, 20000)
+
+fake=Faker()
+rng=np.random.default_rng(123)
+
+#=============================================================================#
+#                                  DATA                                       #
+#=============================================================================#
+
+submitted=pd.Timestamp('2015-01-01')+pd.to_timedelta(rng.integers(0, 2000, n), unit='D')
+review=pd.DataFrame({'submitted_date':submitted,
+                     'published_date':submitted+pd.to_timedelta(rng.integers(0, 400, n), unit='D')})
+
+#=============================================================================#
+#                                BENCHMARK                                    #
+#=============================================================================#
+
+sample=review.head(sample_size)
+start=time.perf_counter()
+[fake.date_between_dates(j['submitted_date'], j['published_date']) for i,j in sample.iterrows()]
+loop=(time.perf_counter()-start)*n/sample_size
+
+start=time.perf_counter()
+review['reviewDate']=dates_between(rng, review['submitted_date'], review['published_date'])
+bulk=time.perf_counter()-start
+
+assert ((review.reviewDate>=review.submitted_date)&(review.reviewDate<=review.published_date)).all()
+
+print(f'Reviews: {n}')
+print(f'iterrows + Faker: {loop:10.3f} s' + (' (extrapolated)' if sample_size<n else ''))
+print(f'dates_between:    {bulk:10.3f} s')
+print(f'Speedup:          {loop/bulk:10.0f} x')
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of query rewriting against materialization.
+Runs the queries of ../query on the materialized graph (TBOX, ABOX and links with the RDFS
+closure, as written by B) and their rewriting (rewrite.py) on the same graph without the
+closure (as loaded from B1, B2 and B3), checks that they return the same answers and
+reports the median latency.
+Input: folder with output_tbox, output_abox and output_link (default ../output) and number
+       of runs per query (default 20), e.g. python bench_rewrite.py ../output 50
+Output: table printed to the console
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+import os, sys, glob, time
+from collections import Counter
+import numpy as np
+from rdflib import Graph
+from rdfs import materialize
+from export import load_output
+from rewrite import Rewriter
+
+folder=sys.argv[1] if len(sys.argv)>1 else '../output'
+runs=int(sys.argv[2]) if len(sys.argv)>2 else 20
+queryfolder='../query'
+
+#=============================================================================#
+#                                  DATA                                       #
+#=============================================================================#
+
+asserted=Graph()
+for name in ['tbox', 'abox', 'link']:
+    load_output(asserted, folder, f'output_{name}')
+start=time.perf_counter()
+materialized=Graph()
+materialized.addN((s, p, o, materialized) for s, p, o in asserted)
+materialize(materialized)
+seconds=time.perf_counter()-start
+rewriter=Rewriter(asserted)
+
+#=============================================================================#
+#                                BENCHMARK                                    #
+#=============================================================================#
+
+def latency(g, query):
+    'Median time of a query (ms) and its answers'
+    times=[]
+    for _ in range(runs):
+        start=time.perf_counter()
+        rows=list(g.query(query))
+        times.append(time.perf_counter()-start)
+    return 1000*np.median(times), Counter(rows)
+
+rows=[]
+for path in sorted(glob.glob(os.path.join(queryfolder, '*.rq'))):
+    with open(path) as f:
+        text=f.read()
+    ms_mat, answers_mat = latency(materialized, text)
+    rewritten=rewriter.rewrite(text)
+    ms_rw, answers_rw = latency(asserted, rewritten)
+    rows.append((os.path.basename(path), sum(answers_mat.values()), ms_mat, ms_rw, answers_mat==answers_rw))
+
+print(f'\nTriples: {len(asserted)} asserted, {len(materialized)} materialized ({seconds:.2f} s)')
+print(f'{"query":18} {"answers":>8} {"materialized (ms)":>18} {"rewritten (ms)":>15} {"same":>5}')
+for name, n, ms_mat, ms_rw, same in rows:
+    print(f'{name:18} {n:8} {ms_mat:18.2f} {ms_rw:15.2f} {str(same):>5}')
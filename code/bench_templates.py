@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the query templates of ../query/templates against preparing every request.
+For every layout of workload.py whose outputs are in the folder, each template is run with
+random values of its parameters taken from the graph (e.g. every author name and topic for
+query4): once with the values written into the query text, which is then parsed, rewritten
+and optimized (what a client sending query text does), and once through the compiled
+template of templates.py. The answers are compared and the p50 per request is reported.
+Input: folder with the outputs (default ../output) and requests per template (default 500),
+       e.g. python bench_templates.py ../output 1000
+Output: table printed to the console
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+import sys, time
+from collections import Counter
+import numpy as np
+from rdflib import Literal, Variable
+from rdflib.plugins.sparql.algebra import traverse
+from rdflib.plugins.sparql.parserutils import CompValue
+from workload import queries, available, load_layout, percentiles
+from templates import Templates, TEMPLATE_FOLDER
+
+folder=sys.argv[1] if len(sys.argv)>1 else '../output'
+requests=int(sys.argv[2]) if len(sys.argv)>2 else 500
+rng=np.random.default_rng(123)
+
+#=============================================================================#
+#                                BENCHMARK                                    #
+#=============================================================================#
+
+def domains(g, template):
+    'Values of each parameter in the graph (strings for literals): the subjects or objects of its predicates'
+    out={}
+    def visit(node):
+        if isinstance(node, CompValue) and node.name=='BGP':
+            for s, p, o in node.triples:
+                if isinstance(s, Variable) and str(s) in template.parameters:
+                    out.setdefault(str(s), sorted(set(g.subjects(p))))
+                if isinstance(o, Variable) and str(o) in template.parameters:
+                    out.setdefault(str(o), sorted(set(str(x) if isinstance(x, Literal) else x for x in g.objects(None, p))))
+    traverse(template.query.algebra, visitPre=visit)
+    return out
+
+def latency(run):
+    'Duration of a request and its answers'
+    start=time.perf_counter()
+    answers=Counter(run())
+    return time.perf_counter()-start, answers
+
+templates=queries(TEMPLATE_FOLDER)
+layouts=available(folder)
+if not layouts:
+    sys.exit(f'No outputs in {folder}: run B, or B1 with B2-B3 (or B2 and B3), first')
+
+rows=[]
+for layout in layouts:
+    g, prepare, seconds = load_layout(folder, layout)
+    cache=Templates(g, prepare)
+    for name, text in templates.items():
+        template=cache.compile(text)
+        values=domains(g, template)
+        text_times, template_times, same = [], [], True
+        for _ in range(requests):
+            bindings={k: v[rng.integers(len(v))] for k, v in values.items()}
+            # Values written as the template types them (e.g. names as xsd:string literals)
+            written=text
+            for k, v in template.bindings(bindings).items():
+                written=written.replace(f'${k}', v.n3())
+            seconds, expected = latency(lambda: g.query(prepare(written)))
+            text_times.append(seconds)
+            seconds, answers = latency(lambda: cache.run(text, **bindings))
+            template_times.append(seconds)
+            same&=answers==expected
+        rows.append((layout, name, percentiles(text_times)[0], percentiles(template_times)[0], same))
+
+print(f'\n{"layout":13} {"template":13} {"text (ms)":>10} {"template (ms)":>14} {"same":>5}')
+for layout, name, ms_text, ms_template, same in rows:
+    print(f'{layout:13} {name:13} {ms_text:10.2f} {ms_template:14.2f} {str(same):>5}')
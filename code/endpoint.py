@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Local SPARQL endpoint standing in for GraphDB, and a load generator for it.
+The endpoint serves one layout of workload.py (e.g. the materialized graph of B) over HTTP
+with the query operation of the SPARQL 1.1 protocol:
+    GET /sparql?query=...
+    POST /sparql with a form (query=...) or an application/sparql-query body
+SELECT/ASK results are returned as JSON (default), XML or CSV (SELECT only) depending on the
+Accept header, CONSTRUCT/DESCRIBE results as N-Triples. Queries that do not parse get a 400
+response, failures while they run a 500. Connections are handled by asyncio and the queries
+are run by a pool of worker processes forked after the graph is loaded and before the server
+listens (so they hold no client connection), so they share the read-only graph and each
+caches its prepared queries.
+The replay client sends the queries of ../query in turn at a fixed rate (open loop, requests
+are not delayed by slow answers) and reports the throughput and latency percentiles.
+Usage:
+    python endpoint.py serve --folder ../output --layout materialized --port 7200 --workers 4
+    python endpoint.py replay --url http://localhost:7200/sparql --qps 50 --duration 30
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+import argparse, asyncio, json, os, time
+import multiprocessing as mp
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs, urlencode
+import numpy as np
+from workload import LAYOUTS, queries, load_layout
+
+# Accept header -> rdflib result format and content type, and the result types each one serializes
+RESULT_FORMATS=[('application/sparql-results+xml', 'xml', ('SELECT', 'ASK')), ('text/csv', 'csv', ('SELECT',)),
+                ('application/sparql-results+json', 'json', ('SELECT', 'ASK'))]
+
+# Prepared queries kept per worker, least recently used first out (the keys are client query texts)
+PLAN_CACHE_SIZE=256
+
+# Graph served by the worker processes and its cached query preparation (set before they are forked)
+_graph, _prepare = None, None
+
+#=============================================================================#
+#                                 WORKERS                                     #
+#=============================================================================#
+
+class QueryError(Exception):
+    'Query that cannot be parsed or prepared (a client error)'
+
+def execute(text, accept):
+    """
+    Worker: run a query on the served graph
+    Input: query text, Accept header
+    Output: (content type, serialized result)
+    Raises QueryError if the query cannot be prepared
+    """
+    try:
+        query=_prepare(text)
+    except Exception as e:
+        raise QueryError(f'{type(e).__name__}: {e}') from None
+    result=_graph.query(query)
+    if result.type in ('CONSTRUCT', 'DESCRIBE'):
+        return 'application/n-triples', result.serialize(format='nt')
+    # The first accepted format that serializes the result, JSON otherwise (e.g. ASK asked as CSV)
+    formats=[(content_type, format) for content_type, format, types in RESULT_FORMATS if result.type in types]
+    content_type, format = next(((c, f) for c, f in formats if c in accept), formats[-1])
+    return content_type, result.serialize(format=format)
+
+def ready():
+    'Worker: no-op run once per worker to start it'
+    pass
+
+#=============================================================================#
+#                                  SERVER                                     #
+#=============================================================================#
+
+STATUS={200:'OK', 400:'Bad Request', 404:'Not Found', 405:'Method Not Allowed', 500:'Internal Server Error'}
+
+class Endpoint:
+    """
+    SPARQL endpoint over HTTP/1.1 (keep-alive)
+    Input: executor running execute(), path of the endpoint
+    """
+    def __init__(self, pool, path='/sparql'):
+        self.pool=pool
+        self.path=path
+        self.served=0
+
+    def query_text(self, method, target, headers, body):
+        'Query of a request, None if there is none'
+        url=urlsplit(target)
+        if method=='GET':
+            return parse_qs(url.query).get('query', [None])[0]
+        content_type=headers.get('content-type', '')
+        if content_type.startswith('application/sparql-query'):
+            return body.decode('utf-8')
+        return parse_qs(body.decode('utf-8')).get('query', [None])[0]
+
+    async def respond(self, method, target, headers, body):
+        'Status, content type and body of the response to a request'
+        if urlsplit(target).path!=self.path:
+            return 404, 'text/plain', b'Not found'
+        if method not in ('GET', 'POST'):
+            return 405, 'text/plain', b'Only GET and POST are supported'
+        text=self.query_text(method, target, headers, body)
+        if not text:
+            return 400, 'text/plain', b'Missing query'
+        loop=asyncio.get_running_loop()
+        try:
+            content_type, payload = await loop.run_in_executor(self.pool, execute, text, headers.get('accept', ''))
+        except QueryError as e:
+            return 400, 'text/plain', str(e).encode('utf-8')
+        except Exception as e:
+            return 500, 'text/plain', f'{type(e).__name__}: {e}'.encode('utf-8')
+        self.served+=1
+        return 200, content_type, payload
+
+    async def handle(self, reader, writer):
+        'Serve the requests of one connection'
+        try:
+            while True:
+                line=await reader.readline()
+                if not line.strip():
+                    break
+                method, target, version = line.decode('latin-1').split()
+                headers={}
+                while True:
+                    line=await reader.readline()
+                    if not line.strip():
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()]=value.strip()
+                body=await reader.readexactly(int(headers.get('content-length', 0)))
+                status, content_type, payload = await self.respond(method, target, headers, body)
+                close=version=='HTTP/1.0' or headers.get('connection', '').lower()=='close'
+                writer.write((f'HTTP/1.1 {status} {STATUS[status]}\r\nContent-Type: {content_type}\r\n'
+                              f'Content-Length: {len(payload)}\r\nConnection: {"close" if close else "keep-alive"}\r\n'
+                              '\r\n').encode('latin-1')+payload)
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+def start_workers(pool, workers):
+    """
+    Start every worker of the pool before the server accepts connections: workers forked later,
+    from the event loop, would inherit the open client sockets, whose connections then never close
+    """
+    for future in [pool.submit(ready) for _ in range(workers)]:
+        future.result()
+
+def serve(folder, layout='materialized', host='localhost', port=7200, workers=4):
+    """
+    Load a layout and serve it until interrupted
+    Input: folder with the outputs, layout (see workload.LAYOUTS), address, worker processes
+    """
+    global _graph, _prepare
+    _graph, prepare, seconds = load_layout(folder, layout)
+    _prepare=lru_cache(maxsize=PLAN_CACHE_SIZE)(prepare)
+    print(f'{layout}: {len(_graph)} triples loaded in {seconds:.2f} s')
+    try:
+        # Workers are forked so they share the loaded graph
+        pool=ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context('fork'))
+    except ValueError:
+        print('Worker processes need fork, running the queries in threads')
+        pool=ThreadPoolExecutor(max_workers=workers)
+    start_workers(pool, workers)
+    endpoint=Endpoint(pool)
+
+    async def main():
+        server=await asyncio.start_server(endpoint.handle, host, port)
+        print(f'SPARQL endpoint on http://{host}:{port}{endpoint.path} ({workers} workers)')
+        async with server:
+            await server.serve_forever()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print(f'Served {endpoint.served} queries')
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+#=============================================================================#
+#                                  REPLAY                                     #
+#=============================================================================#
+
+async def request(url, text):
+    """
+    Send one query (POST form) on a new connection
+    Output: (HTTP status, latency in seconds, response body)
+    """
+    url=urlsplit(url)
+    start=time.perf_counter()
+    reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+    body=urlencode({'query':text}).encode('utf-8')
+    writer.write((f'POST {url.path} HTTP/1.1\r\nHost: {url.netloc}\r\nAccept: application/sparql-results+json\r\n'
+                  f'Content-Type: application/x-www-form-urlencoded\r\nContent-Length: {len(body)}\r\n'
+                  'Connection: close\r\n\r\n').encode('latin-1')+body)
+    await writer.drain()
+    status=int((await reader.readline()).split()[1])
+    length=0
+    while True:
+        line=await reader.readline()
+        if not line.strip():
+            break
+        key, _, value = line.decode('latin-1').partition(':')
+        if key.strip().lower()=='content-length':
+            length=int(value)
+    payload=await reader.readexactly(length)
+    writer.close()
+    return status, time.perf_counter()-start, payload
+
+async def replay(url, workload, qps=10, duration=10):
+    """
+    Send the queries in turn at a target rate
+    Input: endpoint URL, dict name -> query text, queries per second, seconds
+    Output: dict with the number of queries, errors, throughput and latency percentiles (ms)
+    """
+    texts=list(workload.values())
+    tasks=[]
+    start=time.perf_counter()
+    for i in range(int(qps*duration)):
+        delay=start+i/qps-time.perf_counter()
+        if delay>0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(request(url, texts[i%len(texts)])))
+    results=await asyncio.gather(*tasks, return_exceptions=True)
+    elapsed=time.perf_counter()-start
+    ok=[r[1] for r in results if not isinstance(r, BaseException) and r[0]==200]
+    stats={'queries':len(results), 'errors':len(results)-len(ok), 'throughput':len(ok)/elapsed}
+    if ok:
+        for p, v in zip([50, 95, 99], np.percentile(np.asarray(ok)*1000, [50, 95, 99])):
+            stats[f'p{p}']=round(float(v), 2)
+    return stats
+
+#=============================================================================#
+#                                   MAIN                                      #
+#=============================================================================#
+
+if __name__=='__main__':
+    parser=argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands=parser.add_subparsers(dest='command', required=True)
+    server=commands.add_parser('serve', help='serve a layout of the outputs')
+    server.add_argument('--folder', default='../output')
+    server.add_argument('--layout', default='materialized', choices=LAYOUTS)
+    server.add_argument('--host', default='localhost')
+    server.add_argument('--port', type=int, default=7200)
+    server.add_argument('--workers', type=int, default=os.cpu_count())
+    client=commands.add_parser('replay', help='replay the queries of ../query at a target rate')
+    client.add_argument('--url', default='http://localhost:7200/sparql')
+    client.add_argument('--qps', type=float, default=10)
+    client.add_argument('--duration', type=float, default=10)
+    client.add_argument('--queries', default='../query')
+    args=parser.parse_args()
+
+    if args.command=='serve':
+        serve(args.folder, args.layout, args.host, args.port, args.workers)
+    else:
+        stats=asyncio.run(replay(args.url, queries(args.queries), args.qps, args.duration))
+        print(json.dumps(stats, indent=2))
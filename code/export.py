@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Output of the generated graphs in several formats.
+RDF/XML and Turtle are written by the rdflib serializers. N-Triples and N-Quads are written
+line by line by triples.NTriplesWriter, which is faster and can compress the output and
+split it into files of bounded size for bulk loaders.
+The outputs can be read back in any of these formats with load_output.
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+import os, re
+from rdflib import Dataset, Graph, Literal
+from triples import sdm, NTriplesWriter, SUFFIXES, compressor, decompressed
+
+# Format name -> file extension
+EXTENSIONS={'xml':'rdf', 'turtle':'ttl', 'nt':'nt', 'nquads':'nq'}
+
+# File extension -> rdflib parser
+PARSERS={'rdf':'xml', 'ttl':'turtle', 'nt':'nt', 'nq':'nquads'}
+
+# Formats written line by line (streamable, compressible and splittable)
+LINE_FORMATS=['nt', 'nquads']
+
+#=============================================================================#
+#                                FUNCTIONS                                    #
+#=============================================================================#
+
+def output_path(name, format='xml', compress=None):
+    'File name of an output, e.g. output_abox.nt.gz'
+    return f'{name}.{EXTENSIONS[format]}{SUFFIXES[compress]}'
+
+def graph_name(name):
+    'Named graph of an output in N-Quads, e.g. output_abox -> sdm:abox'
+    return sdm[os.path.basename(name).replace('output_', '', 1)]
+
+def writer(name, format='nt', compress=None, max_bytes=None):
+    """
+    Streaming sink writing the triples of an output as they are generated
+    Input: output name (e.g. 'output_abox'), 'nt' or 'nquads', compression, maximum file size
+    Output: NTriplesWriter
+    """
+    if format not in LINE_FORMATS:
+        raise ValueError(f'Streaming needs a line based format ({", ".join(LINE_FORMATS)}), not {format}')
+    return NTriplesWriter(output_path(name, format, compress), compress=compress, max_bytes=max_bytes,
+                          graph=graph_name(name) if format=='nquads' else None)
+
+def export(g, name, format='xml', compress=None, max_bytes=None):
+    """
+    Write a graph to the current folder
+    Input:
+        g: rdflib Graph or store.TripleStore
+        name: output name without extension (e.g. 'output_abox')
+        format: 'xml', 'turtle', 'nt' or 'nquads'
+        compress: None, 'gzip' or 'zstd'
+        max_bytes: split N-Triples/N-Quads into files of at most max_bytes (uncompressed)
+    Output: list of files written
+    Triples with a literal subject (inferred by RDFS) cannot be written and are left out.
+    """
+    if format in LINE_FORMATS:
+        w=writer(name, format, compress, max_bytes)
+        w.addN((s, p, o, None) for s, p, o in g)
+        w.close()
+        return w.paths
+
+    if max_bytes:
+        raise ValueError(f'Only {", ".join(LINE_FORMATS)} outputs can be split')
+    if hasattr(g, 'to_graph'):
+        g=g.to_graph()
+    written=sum(1 for s, _, _ in g if not isinstance(s, Literal))
+    if written<len(g):
+        valid=Graph()
+        for prefix, namespace in g.namespaces():
+            valid.bind(prefix, namespace, replace=True)
+        valid.addN((s, p, o, valid) for s, p, o in g if not isinstance(s, Literal))
+        g=valid
+    path=output_path(name, format, compress)
+    if compress is None:
+        g.serialize(destination=path, format=format)
+    else:
+        with open(path, 'wb') as raw:
+            f=compressor(compress, raw)
+            f.write(g.serialize(format=format, encoding='utf-8'))
+            f.close()
+    print(f'Written {written} triples to {path}')
+    return [path]
+
+def output_files(folder, name):
+    """
+    Files of an output in the first format found (e.g. output_abox-0001.nt.gz, output_abox-0002.nt.gz)
+    Output: list of (path, extension, compression)
+    """
+    pattern=re.compile(rf'{re.escape(name)}(?:-\d{{4,}})?\.(\w+?)(\.gz|\.zst)?')
+    compressions={suffix: compress for compress, suffix in SUFFIXES.items()}
+    files=[]
+    for f in sorted(os.listdir(folder)):
+        m=pattern.fullmatch(f)
+        if m and m.group(1) in PARSERS:
+            files.append((os.path.join(folder, f), m.group(1), compressions[m.group(2) or '']))
+    for ext in EXTENSIONS.values():
+        if any(e==ext for _, e, _ in files):
+            return [f for f in files if f[1]==ext]
+    return []
+
+def load_output(g, folder, name):
+    """
+    Add the triples of an output written by export (any format, compression or split)
+    Input: graph, folder, output name (e.g. 'output_abox')
+    Output: list of files read
+    """
+    files=output_files(folder, name)
+    if not files:
+        raise FileNotFoundError(f'No {name} output in {folder}')
+    for path, ext, compress in files:
+        with decompressed(path, compress) as f:
+            data=f.read()
+        if ext=='nq':
+            ds=Dataset()
+            ds.parse(data=data, format='nquads')
+            g.addN((s, p, o, g) for s, p, o, _ in ds.quads())
+        else:
+            g.parse(data=data, format=PARSERS[ext])
+    return [path for path, _, _ in files]
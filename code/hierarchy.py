@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Precomputed class and property hierarchies.
+query2_case2.rq and query3_case2.rq follow rdfs:subClassOf* paths, which rdflib evaluates by
+traversing the graph at every execution although the hierarchies are fixed by the TBOX.
+B1 and ALL write their reflexive-transitive closure (the closure table) as output_hierarchy,
+a named graph sdm:hierarchy with --format nquads, and HierarchyGraph answers the * and + paths
+over rdfs:subClassOf and rdfs:subPropertyOf with dictionary lookups in that table.
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+from collections import defaultdict
+from rdflib import Graph, RDFS
+from rdflib.paths import MulPath
+from rdfs import edges, transitive
+
+# Relations closed in the table
+RELATIONS=[RDFS.subClassOf, RDFS.subPropertyOf]
+
+#=============================================================================#
+#                                 HIERARCHY                                   #
+#=============================================================================#
+
+def closure_table(tbox):
+    """
+    Reflexive-transitive closure of the class and property hierarchies of a TBOX
+    Input: graph with the TBOX
+    Output: rdflib Graph with a triple (x, relation, y) for every y reachable from x
+    """
+    g=Graph()
+    g.bind('rdfs', RDFS)
+    for relation in RELATIONS:
+        adjacency=edges(tbox, relation)
+        for x, ys in transitive(adjacency).items():
+            g.add((x, relation, x))
+            for y in ys:
+                g.add((x, relation, y))
+                g.add((y, relation, y))
+    return g
+
+class Hierarchy:
+    """
+    Index of the hierarchies: successors and predecessors of every node, per relation
+    Input: graph with the relations (e.g. the TBOX), closed here, True if it is a closure table
+           (its reflexive pairs are then the zero-length paths, not cycles)
+    """
+    def __init__(self, g, table=False):
+        self.up, self.down = {}, {}
+        for relation in RELATIONS:
+            adjacency=edges(g, relation)
+            if table:
+                for x, ys in adjacency.items():
+                    ys.discard(x)
+            # Transitive closure without the zero-length paths, which * adds for every node
+            up=transitive(adjacency)
+            down=defaultdict(set)
+            for x, ys in up.items():
+                for y in ys:
+                    down[y].add(x)
+            self.up[relation], self.down[relation] = up, dict(down)
+
+    def pairs(self, relation, s=None, o=None, zero=True):
+        """
+        Pairs of a path relation* (zero) or relation+
+        Input: relation, subject and/or object (at least one)
+        Output: iterable of (subject, object)
+        """
+        up, down = self.up[relation], self.down[relation]
+        if s is not None and o is not None:
+            return [(s, o)] if (zero and s==o) or o in up.get(s, ()) else []
+        if s is not None:
+            return [(s, y) for y in ({s}|up.get(s, set()) if zero else up.get(s, ()))]
+        return [(x, o) for x in ({o}|down.get(o, set()) if zero else down.get(o, ()))]
+
+class HierarchyGraph(Graph):
+    """
+    rdflib Graph answering relation* and relation+ paths over the hierarchies with the index,
+    other patterns (and these paths with no bound end) as rdflib does
+    Input: Hierarchy of the graph's TBOX (set later with the hierarchy attribute), Graph arguments
+    """
+    def __init__(self, hierarchy=None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.hierarchy=hierarchy
+
+    def triples(self, triple):
+        s, p, o = triple
+        if (self.hierarchy is not None and isinstance(p, MulPath) and p.path in RELATIONS
+                and p.mod in ('*', '+') and (s is not None or o is not None)):
+            for _s, _o in self.hierarchy.pairs(p.path, s, o, zero=p.mod=='*'):
+                yield _s, p, _o
+        else:
+            yield from super().triples(triple)
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental ABOX generation.
+The prepared dataframes of each run are kept in a manifest folder (<savefolder>/.manifest).
+The next run fingerprints every row, compares the fingerprints with the previous run and
+only converts the rows that were added or removed, writing the triples to insert and to
+delete (output_abox_add.nt, output_abox_delete.nt) instead of the whole ABOX.
+Triples of removed rows that are still produced by an unchanged row sharing one of their
+ids (e.g. the Chair type of an organizer of several conferences) are not deleted.
+The inferred graph of B is maintained the same way: its manifest (<savefolder>/.manifest-inference)
+also keeps the rdfs.Closure of the previous run, which is updated with the ABOX delta and
+gives the triples to insert and delete in the materialized graph.
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+import os, json, pickle
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from triples import emit, ref_columns
+from abox import converter_triples
+from export import writer
+
+MANIFEST='.manifest'
+CLOSURE_MANIFEST='.manifest-inference'
+
+#=============================================================================#
+#                                FUNCTIONS                                    #
+#=============================================================================#
+
+class TripleSet(set):
+    'Set of triples with the addN interface of rdflib.Graph'
+    def addN(self, quads):
+        self.update((s, p, o) for s, p, o, c in quads)
+
+def fingerprints(df):
+    """
+    Hash of every row of a dataframe
+    Output: uint64 numpy array
+    """
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+def has_manifest(folder, manifest=MANIFEST):
+    'A previous run saved its manifest in folder'
+    return os.path.exists(os.path.join(folder, manifest, 'manifest.json'))
+
+def save_manifest(folder, jobs, manifest=MANIFEST):
+    """
+    Save the dataframes of a run as the reference of the next incremental run
+    Input: output folder, list of (converter, dataframe, kwargs), manifest folder name
+    """
+    path=os.path.join(folder, manifest)
+    os.makedirs(path, exist_ok=True)
+    manifest={'created':datetime.now().isoformat(timespec='seconds'), 'frames':{}}
+    for converter, df, kwargs in jobs:
+        name=converter.__name__
+        df.to_pickle(os.path.join(path, f'{name}.pkl'))
+        manifest['frames'][name]={'rows':len(df), 'columns':list(map(str, df.columns)), 'kwargs':kwargs}
+    with open(os.path.join(path, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+def delta(old, new, triples, old_triples=None):
+    """
+    Triples to insert and to delete when a dataframe changes from old to new
+    Input: previous and current dataframe, triple specs of their converter (and of the
+           previous run when they differ, e.g. links=True in B2-B3 after B2)
+    Output: (insert, delete) sets of triples
+    """
+    if old_triples is not None and old_triples!=triples:
+        # All rows are compared when the mapping changed
+        insert, delete = TripleSet(), TripleSet()
+        emit(insert, new, triples)
+        emit(delete, old, old_triples)
+        return insert-delete, delete-insert
+
+    h_old, h_new = fingerprints(old), fingerprints(new)
+    removed=old[~np.isin(h_old, h_new)]
+    added=new[~np.isin(h_new, h_old)]
+    kept=new[np.isin(h_new, h_old)]
+
+    # Unchanged rows sharing an id with a removed row can produce the same triples
+    shared=np.zeros(len(kept), dtype=bool)
+    for col in ref_columns(triples):
+        shared|=kept[col].isin(removed[col].dropna()).to_numpy()
+
+    insert, delete, still = TripleSet(), TripleSet(), TripleSet()
+    emit(insert, added, triples)
+    emit(delete, removed, triples)
+    emit(still, kept[shared], triples)
+    return insert-delete, delete-insert-still
+
+def changes(folder, jobs, manifest=MANIFEST):
+    """
+    ABOX changes since the previous run
+    Input: output folder, list of (converter, dataframe, kwargs), manifest folder name
+    Output: (insert, delete) sets of triples
+    """
+    path=os.path.join(folder, manifest)
+    with open(os.path.join(path, 'manifest.json')) as f:
+        manifest=json.load(f)
+    insert, delete = set(), set()
+    for converter, df, kwargs in jobs:
+        name=converter.__name__
+        if name in manifest['frames']:
+            old=pd.read_pickle(os.path.join(path, f'{name}.pkl'))
+            old_triples=converter_triples(converter, **manifest['frames'][name]['kwargs'])
+        else:
+            old, old_triples = df.iloc[:0], None
+        plus, minus = delta(old, df, converter_triples(converter, **kwargs), old_triples)
+        print(f'Delta {name}: +{len(plus)} -{len(minus)}')
+        insert|=plus
+        delete|=minus
+
+    # A triple moved between converters is neither inserted nor deleted
+    return insert-delete, delete-insert
+
+def write_changes(folder, name, insert, delete, compress=None):
+    """
+    Write the triples to insert and to delete (<name>_add.nt and <name>_delete.nt)
+    Output: number of triples written to insert and to delete (without literal subjects)
+    """
+    counts=[]
+    for suffix, triples in [('add', insert), ('delete', delete)]:
+        with writer(os.path.join(folder, f'{name}_{suffix}'), 'nt', compress) as w:
+            w.addN((s, p, o, None) for s, p, o in sorted(triples, key=lambda t: tuple(map(str, t))))
+        counts.append(w.count)
+    return tuple(counts)
+
+def write_delta(folder, jobs, compress=None):
+    """
+    Write the changes since the previous run (output_abox_add.nt and output_abox_delete.nt)
+    Input: output folder, list of (converter, dataframe, kwargs), compression of the files
+    Output: number of triples to insert and to delete
+    """
+    return write_changes(folder, 'output_abox', *changes(folder, jobs), compress)
+
+def save_closure(folder, closure):
+    'Save the rdfs.Closure of B with its manifest'
+    with open(os.path.join(folder, CLOSURE_MANIFEST, 'closure.pkl'), 'wb') as f:
+        pickle.dump(closure, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def load_closure(folder):
+    'rdfs.Closure saved by the previous incremental run of B'
+    with open(os.path.join(folder, CLOSURE_MANIFEST, 'closure.pkl'), 'rb') as f:
+        return pickle.load(f)
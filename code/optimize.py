@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Query optimizer for the local query path (rdflib).
+rdflib evaluates the triple patterns of a BGP as nested loops, in the order of its own
+heuristic (number of unbound terms), e.g. query4.rq starts with every venue typed
+sdm:Conference instead of the single author named "Yunpeng Liu". The optimizer reorders the
+patterns greedily with the statistics of stats.py: the pattern with the fewest estimated
+answers first, then the cheapest pattern sharing a variable with those already evaluated.
+As rdflib sorts the patterns of a BGP again when it evaluates it, the chosen order is kept by
+evaluating the patterns one at a time in lazy joins (nested loops).
+The patterns are not changed otherwise: string values are typed in the query files
+(e.g. "Database"^^xsd:string in query4.rq), since rdflib keeps plain and xsd:string literals
+distinct.
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+from functools import reduce
+from rdflib import Literal, URIRef, Variable, RDF
+from rdflib.plugins.sparql import prepareQuery
+from rdflib.plugins.sparql.algebra import BGP, Join, traverse, _traverseAgg, _addVars
+from rdflib.plugins.sparql.parserutils import CompValue
+from rdflib.plugins.sparql.sparql import Query
+
+#=============================================================================#
+#                                OPTIMIZER                                    #
+#=============================================================================#
+
+def variables(triple):
+    'Variables of a triple pattern'
+    return set(x for x in triple if isinstance(x, Variable))
+
+class Optimizer:
+    """
+    Reorders the BGPs of queries
+    Input: stats.Statistics of the queried graph
+    """
+    def __init__(self, stats):
+        self.stats=stats
+
+    def cardinality(self, triple, bound=()):
+        """
+        Estimated number of answers of a triple pattern
+        Input: triple pattern, variables bound by the patterns evaluated before
+        """
+        s, p, o = triple
+        known=lambda x: not isinstance(x, Variable) or x in bound
+        if isinstance(p, Variable):
+            return self.stats.triples
+        if not isinstance(p, URIRef):
+            # Property path, e.g. the superclasses of a class (rdfs:subClassOf*)
+            return 1 if known(s) or known(o) else self.stats.triples/max(len(self.stats.predicates), 1)
+        stats=self.stats.predicates.get(p)
+        if stats is None:
+            return 0
+        n=stats['triples']
+        if p==RDF.type and not isinstance(o, Variable):
+            n=self.stats.classes.get(o, 0)
+        elif isinstance(o, Literal) and str(o) in stats.get('values', {}):
+            # Frequent value, e.g. a common name
+            n=stats['values'][str(o)]
+        elif known(o):
+            n/=max(stats['objects'], 1)
+        if known(s):
+            n/=max(stats['subjects'], 1)
+        return n
+
+    def reorder(self, triples, bound=()):
+        'Triple patterns in evaluation order, given the variables bound before the query runs'
+        remaining=list(triples)
+        bound, out = set(bound), []
+        while remaining:
+            # Avoid cartesian products: prefer the patterns joining with the evaluated ones
+            connected=[t for t in remaining if variables(t)&bound] or remaining
+            best=min(connected, key=lambda t: self.cardinality(t, bound))
+            remaining.remove(best)
+            out.append(best)
+            bound|=variables(best)
+        return out
+
+    def plan(self, triples, bound=()):
+        'Lazy joins evaluating the reordered patterns of a BGP in order'
+        def join(p1, p2):
+            node=Join(p1, p2)
+            node['lazy']=True
+            return node
+        return reduce(join, (BGP([t]) for t in self.reorder(triples, bound))) if triples else BGP([])
+
+    def optimize(self, query, reorder=True, bound=()):
+        """
+        Query with reordered BGPs
+        Input: query text or rdflib prepared Query, False to keep the BGPs as they are, variables
+               bound when the query is run (parameters of templates.py)
+        Output: rdflib Query
+        """
+        if isinstance(query, str):
+            query=prepareQuery(query)
+        bound=set(map(Variable, bound))
+        visit=lambda n: self.plan(n.triples, bound) if reorder and isinstance(n, CompValue) and n.name=='BGP' else None
+        algebra=traverse(query.algebra, visitPost=visit)
+        _traverseAgg(algebra, _addVars)
+        return Query(query.prologue, algebra)
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+Command line options shared by the scripts, e.g. python BDMA11F-B2-AlmutawaBondocXu.py --workers 8
+Unknown arguments are ignored, so the scripts still run from an IDE or a notebook.
+"""
+
+import argparse
+
+def parse_args():
+    'Options of the current run'
+    parser=argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=1,
+                        help='processes generating the ABOX with --stream (1 runs the converters sequentially)')
+    parser.add_argument('--outputs', nargs='+', default=['tbox','abox','link','inference'],
+                        choices=['tbox','abox','link','inference'],
+                        help='files written by the single-pass pipeline (BDMA11F-ALL)')
+    parser.add_argument('--format', default='xml', choices=['xml','turtle','nt','nquads'],
+                        help='format of the output files')
+    parser.add_argument('--compress', default=None, choices=['gzip','zstd'],
+                        help='compress the output files')
+    parser.add_argument('--max-bytes', type=int, default=None,
+                        help='split N-Triples/N-Quads outputs into files of at most this size')
+    parser.add_argument('--incremental', action='store_true',
+                        help='only write the ABOX (B2) or inferred graph (B) triples to add and delete since the previous incremental run')
+    parser.add_argument('--stream', action='store_true',
+                        help='write the ABOX (B2, B2-B3) while it is generated instead of building a graph (--format nt or nquads)')
+    parser.add_argument('--compact', action='store_true',
+                        help='keep the ABOX (B2, B2-B3) in the dictionary-encoded store of store.py instead of an rdflib graph')
+    args, _ = parser.parse_known_args()
+    if args.stream and args.format not in ('nt', 'nquads'):
+        parser.error(f'--stream needs --format nt or nquads, not {args.format}')
+    if args.workers>1 and not args.stream:
+        parser.error('--workers needs --stream: the workers write N-Triples/N-Quads shards appended to the output')
+    if args.stream and args.compact:
+        parser.error('--stream and --compact cannot be combined')
+    return args
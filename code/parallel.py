@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Parallel ABOX generation.
+The converters write disjoint sets of triples and each row is converted on its own, so the
+converters, and row ranges of the big dataframes, can run in separate processes.
+Every job writes its own N-Triples shard file; the shards are then appended to the streamed
+output in job order, so the result does not depend on the number of workers. Only line
+formats are supported: the shards are concatenated as they are, without parsing them again.
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+import os, shutil, tempfile
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from triples import NTriplesWriter, SUFFIXES, collectors
+
+#=============================================================================#
+#                                FUNCTIONS                                    #
+#=============================================================================#
+
+def shards(jobs, shard_rows):
+    """
+    Split the jobs on big dataframes into row ranges
+    Input: list of (converter, dataframe, kwargs), maximum number of rows per shard
+    Output: list of (converter, dataframe, kwargs)
+    """
+    out=[]
+    for converter, df, kwargs in jobs:
+        for start in range(0, max(len(df), 1), shard_rows):
+            out.append((converter, df.iloc[start:start+shard_rows], kwargs))
+    return out
+
+def run_shard(converter, df, kwargs, path, compress, graph):
+    """
+    Worker: run one converter into its own shard file
+    Output: (number of triples written, statistics of the shard if the parent collects them)
+    """
+    from stats import Statistics
+    stats=Statistics() if collectors else None
+    # The collectors of the parent are copies in the worker
+    collectors[:]=[stats] if stats is not None else []
+    w=NTriplesWriter(path, compress=compress, graph=graph)
+    converter(w, df, **kwargs)
+    w.close(verbose=False)
+    return w.count, stats
+
+def generate(g, jobs, workers, shard_rows=100000):
+    """
+    Run the converters on a process pool and append their triples to g
+    Input:
+        g: NTriplesWriter (the shards are appended to its file)
+        jobs: list of (converter, dataframe, kwargs), as in converter(g, dataframe, **kwargs)
+        workers: number of processes
+        shard_rows: maximum number of rows converted by one job
+    Output: number of triples generated
+    """
+    if not isinstance(g, NTriplesWriter):
+        raise TypeError('Parallel generation writes N-Triples/N-Quads shards: use a streaming writer (--stream)')
+    jobs=shards(jobs, shard_rows)
+    try:
+        # Workers are forked so they do not re-run the calling script
+        context=mp.get_context('fork')
+    except ValueError:
+        print('Parallel generation needs fork, running sequentially')
+        for converter, df, kwargs in jobs:
+            converter(g, df, **kwargs)
+        return None
+
+    folder=tempfile.mkdtemp(prefix='abox-', dir=os.path.dirname(os.path.abspath(g.path)))
+    paths=[os.path.join(folder, f'shard-{i:05d}.nt'+SUFFIXES[g.compress]) for i in range(len(jobs))]
+    print(f'Generating {len(jobs)} shards with {workers} workers')
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures=[pool.submit(run_shard, converter, df, kwargs, path, g.compress, g.graph)
+                     for (converter, df, kwargs), path in zip(jobs, paths)]
+            # Merge in job order as the shards complete
+            total=0
+            for future, path in zip(futures, paths):
+                count, stats = future.result()
+                for collector in collectors:
+                    collector.merge(stats)
+                g.append(path, count)
+                total+=count
+                os.remove(path)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+    return total
@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""
+Data preparation shared by the ABOX scripts (B, B2, B2-B3 and the single-pass pipeline).
+Reads the csv files of Lab 1, synthesizes the missing fields and returns the dataframes
+used by the converters in abox.py.
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+import gc
+import pandas as pd
+import numpy as np
+from ingest import read_csv
+from synth import Keyed, sample, dates, dates_between, paragraphs, dois, ssns, venue_authors, pick_excluding, assign_topics
+
+# Dataframes returned by prepare
+FRAMES=['area','author','conference','journal','volume','proceeding','paper','review','hasAuthor','hasTopic']
+
+#=============================================================================#
+#                                FUNCTIONS                                    #
+#=============================================================================#
+
+def convert_to_dt(df):
+    'Converts date columns (inferred from column names) into pandas datetime types'
+    for col in [i for i in df.columns if 'date' in i.lower() or i.endswith('dt')]:
+        print(f'To date: {col}')
+        df[col]=pd.to_datetime(df[col])
+
+def to_camel_case(text):
+    """
+    Convert string to camel case (no spaces)
+    """
+    x=[i for i in text]
+    return ''.join(sum([],[x[0].upper()]+x[1:]))
+
+#=============================================================================#
+#                               PREPARE DATA                                  #
+#=============================================================================#
+
+def prepare(fake, seed, topics=1, topic_weights=None):
+    """
+    Prepares the dataframes of the ABOX. Must be called from the data folder.
+    Input: Faker object, seed of the random fields (each field of a row is drawn from a hash of
+           the row's id and the seed, see synth.Keyed), number of topics per paper and venue,
+           optional dict topic name -> weight (missing topics: 0)
+    Output: dict name -> dataframe with the frames in FRAMES, nulls replaced by None
+    """
+    rows=lambda keys, name: Keyed(seed, keys, name)
+
+    print("/=============================/")
+    print('/        PREPARE DATA         /')
+    print("/=============================/")
+
+    #============================================================================== AUTHOR 
+    # Read authors and merge institution
+    author=read_csv('authors.csv').merge(read_csv('institutions.csv').rename(columns={'intitutionid':'institutionid',
+                                                                                           'name':'institution'}), 
+                                            on='institutionid').drop(columns='institutionid').drop(columns=['affiliations','homepage','fake'])
+    # Add aditional information
+    key=author.authorId
+    author['sex']=rows(key, 'sex').choice(['Female','Male'], len(author))
+    author['birthdate']=dates(rows(key, 'birthdate'), len(author))
+    author['originCountry']=sample(fake, rows(key, 'originCountry'), 'country', len(author))
+    author['hIndex']=author.hIndex.fillna(pd.Series(rows(key, 'hIndex').integers(1, 11, len(author))))
+
+    # Clean up
+    author=author.dropna().reset_index(drop=True).rename(columns={'authorId':'author'})
+    author.drop(columns=['paperCount','citationCount'], inplace=True)
+    convert_to_dt(author)
+
+    #============================================================================== PAPER
+    # Read paper
+    paper=read_csv('paper.csv').drop(columns=['sha','fake']).rename(columns={'id':'paper'})
+
+    # Synthesize new fields
+    key=paper.paper
+    paper['wordcount']=rows(key, 'wordcount').integers(4000, 7001, len(paper))
+    paper['abstract']=paper.abstract.fillna(pd.Series(paragraphs(fake, rows(key, 'abstract'), len(paper))))
+    paper['type']=rows(key, 'type').choice(['short','demo','full','poster'], len(paper))
+    paper['doi']=dois(rows(key, 'doi'), len(paper))
+    paper.drop(columns=['url'], inplace=True)
+
+    # Merge paper information with conference and journal publication match
+    paper=pd.concat(
+        [
+            (read_csv('submitted_to_conference.csv').merge(read_csv('holds.csv').drop(columns=['fake']), on='edition')
+             .drop(columns=['fake'])),
+            (read_csv('submitted_to_journal.csv').merge(read_csv('volume_of.csv').drop(columns=['fake']), on='volume')
+             .drop(columns=['fake']))
+        ]
+    ).drop_duplicates().merge(paper, on='paper')
+
+    # Fill in null dates
+    dts=pd.Series(dates(rows(paper.paper, 'date'), len(paper)))
+    paper['published_date']=paper['published_date'].fillna(dts)
+    paper['submitted_date']=paper['submitted_date'].fillna(dts)
+
+    # Unify columns
+    paper['venue_type']=np.where(paper.conference.notna(), 'Conference', 'Journal')
+    paper['venue']=paper.conference.fillna(paper.journal)
+    paper['publication']=paper.edition.fillna(paper.volume)
+    paper.drop(columns=['edition','conference','volume','journal'], inplace=True)
+
+    # Since editions will now be conference conepts, all papers submitted to a conference will use the id of its proceeding as id for the conference
+    m=paper.venue_type=='Conference'
+    paper.loc[m, ['venue']] = (
+        paper.loc[m, ['publication']].values)
+
+    convert_to_dt(paper)
+
+    #### PAPER CONSTRAINTS
+
+    # Submission date is less then published date
+    m=paper.submitted_date>paper.published_date
+    paper.loc[m, ['published_date', 'submitted_date']] = (
+        paper.loc[m, ['submitted_date', 'published_date']].values)
+
+    # Poster can only be in conference. if not conference, change type
+    paper.loc[(paper.type=='poster')&(paper.venue_type=='Journal'),
+              'type']=pd.Series(rows(paper.paper, 'journalType').choice(['short','demo','full'], len(paper)))
+
+    # Infer publication date from paper published dates
+    published=paper.groupby(['venue_type','venue','publication']).agg({'published_date':max,'submitted_date':min}).reset_index()
+    published['published_date']=published[['published_date','submitted_date']].max(axis=1)
+    published.drop(columns=['submitted_date'], inplace=True)
+    submitted=paper[['paper','submitted_date','venue_type','venue','publication']].copy()
+
+    # Get decision per paper
+    decision=read_csv('reviews.csv').groupby('paper').agg({'decision':['sum','count']})
+    decision=((decision.iloc[:,0]/decision.iloc[:,1])>0.5).to_dict()
+    paper['decision']=paper.paper.map(decision)
+
+    # Delete values for non-approved papers based on review decisions
+    for col in ['published_date','publication','doi']:
+        paper.loc[(paper.decision==False)&(paper[col].notna()),[col]]=np.nan
+
+    paper.drop(columns=['published_date'], inplace=True)
+
+    # Create submission id -- note: submission and paper has a one to one relationship, as stated in the assumptions
+    paper['submission']='sub-'+paper.paper.astype(int).astype(str)
+
+
+    #============================================================================== REVIEWS
+    # Read reviews
+    review=read_csv('reviews.csv').rename(columns={'reviewerid':'reviewer'})
+
+    # Get dates
+    review=(submitted
+     .merge(published, on=['venue_type','venue','publication'], how='outer')
+     .merge(review, on=['paper'], how='right')
+    )
+    key=review['paper'].astype(str)+'-'+review['reviewer'].astype(str)
+    review['reviewDate']=dates_between(rows(key, 'reviewDate'), review['submitted_date'], review['published_date'])
+    review.drop(columns=['venue_type','venue','publication','submitted_date','published_date'], inplace=True)
+    review['review']=review['paper'].astype(str)+'-'+review['reviewer'].astype(str)
+
+    #create submission id instead of paper id 
+    review['submission']='sub-'+review.paper.astype(int).astype(str)
+    review.drop(columns=['paper'], inplace=True)
+
+    #============================================================================== CONFERENCE
+    # Note: using edition as conference title
+    conference=(read_csv('conference.csv').rename(columns={'id':'conference'})
+                .merge(read_csv('holds.csv').drop(columns=['fake']), on=['conference'])
+               .merge(read_csv('edition.csv').rename(columns={'id':'edition'}).drop(columns=['fake','conference']), on='edition')
+               .rename(columns={'venue':'location'})
+                .drop(columns=['url'])
+                .rename(columns={'edition':'title','name':'conferenceSeries'})
+               .drop_duplicates()
+               )
+    conference['conference']=conference['proceeding'].copy()
+    conference['title']=conference['year'].astype(str) + ' ' + conference['conferenceSeries']
+    key=conference.conference
+    conference['type']=rows(key, 'type').choice(['workshop', 'symposium', 'expert group','regular'], len(conference))
+
+    # SENSE CHECK: Check for conference series with more than one conference -- there is one series with 2 conferences
+    conference[conference.duplicated(subset=['conferenceSeries'], keep=False)]
+
+    # generate more fake fields
+    conference['issn']=conference.issn.fillna(pd.Series(ssns(rows(key, 'issn'), len(conference))))
+    conference['publisher']=sample(fake, rows(key, 'publisher'), 'company', len(conference))
+
+    # Get published date
+    conference=(conference.merge(published[published.venue_type=='Conference']
+                      .rename(columns={'venue':'conference','publication':'proceeding'}))
+                .drop(columns=['venue_type'])
+    )
+
+    # If organizer is not an author, make null then order
+    conference.loc[~conference.chairperson.isin(author.author),'chairperson']=np.nan
+    conference.sort_values(['conference','title','chairperson'], inplace=True)
+
+    # Separate conference and proceeding: note that there is a one to one correspondence for them
+    cols=['title','chairperson','location','Start','End','year','conferenceSeries','type']
+    proceeding=conference.copy()
+    conference=conference[['conference']+cols].drop_duplicates().reset_index(drop=True).rename(columns={'chairperson':'organizer'})
+    proceeding.drop(columns=cols, inplace=True)
+
+    #============================================================================== JOURNAL
+    # Note: using volume id as volume as proceeding name
+    journal=(read_csv('journal.csv').rename(columns={'id':'journal'})
+                .merge(read_csv('volume_of.csv').drop(columns=['fake']), on=['journal'])
+               .merge(read_csv('volume.csv').drop(columns=['volume']).rename(columns={'id':'volume'}).drop(columns=['fake']), on='volume')
+               .drop_duplicates()
+             .drop(columns=['url'])
+             .rename(columns={'name':'title'})
+            )
+    # Fill in null titles
+    titles=journal[['journal','title']].drop_duplicates().reset_index(drop=True)
+    titles.loc[titles.title.isna(), 'title']=pd.Series([i for i in 'Journal of '+fake.word() for i in range(len(titles))])
+    journal['title']=journal.journal.map(titles.set_index('journal').title.to_dict())
+    del titles
+
+    # Get published date
+    journal=(journal.merge(published[published.venue_type=='Journal']
+                      .rename(columns={'venue':'journal','publication':'volume'}))
+                .drop(columns=['venue_type'])
+    )
+
+    # generate more fake fields
+    key=journal.volume
+    journal['issn']=journal.issn.fillna(pd.Series(ssns(rows(key, 'issn'), len(journal))))
+    journal['publisher']=sample(fake, rows(key, 'publisher'), 'company', len(journal))
+    journal.drop(columns=['year'], inplace=True)
+
+    # If organizer is not an author, make null then order
+    journal.loc[~journal.editor.isin(author.author),'editor']=np.nan
+    journal.sort_values(['journal','title','editor'], inplace=True)
+
+    # Separate journal and volume
+    cols=['title','editor']
+    volume=journal.copy()
+    journal=journal[['journal']+cols].groupby(['journal','title']).head(1).reset_index(drop=True).rename(columns={'editor':'organizer'})
+    volume.drop(columns=cols, inplace=True)
+
+    #============================================================================== AUTHORSHIP
+    # Make sure authors and papers are in the main dataframes (to make sure they have propoerties)
+    hasAuthor=read_csv('writes.csv').drop(columns=['fake'])
+    hasAuthor=hasAuthor.dropna().reset_index(drop=True)
+    hasAuthor=hasAuthor[hasAuthor.paper.isin(paper.paper)&(hasAuthor.author.isin(author.author))].reset_index(drop=True)
+
+    #============================================================================== ORGANIZERS
+    # Fill null organizers in journal and conference - make sure they are not authors in the same conference edition/journal
+    a_list=author.author.unique()
+    candidates=rows(a_list, 'organizer')
+    authors_by_venue=venue_authors(paper, hasAuthor)
+    venues={'conference':conference, 'journal':journal}
+    for df in venues:
+        nulls=venues[df][venues[df].organizer.isna()]
+        picks={i:pick_excluding(candidates, a_list, authors_by_venue.get((to_camel_case(df), i), set()), (df, i)) for i in nulls[df].unique()}
+        m=venues[df][df].isin(picks.keys())
+        venues[df].loc[m,'organizer']=venues[df].loc[m, df].map(picks)
+
+    del venues, nulls, a_list, candidates, authors_by_venue
+
+    # Edit Paper/submission
+    # Get information about the chair/editor that assigned reviewers for that submission
+    org=pd.concat([conference[['conference','organizer']].assign(venue_type='Conference').rename(columns={'conference':'venue'}),
+               journal[['journal','organizer']].assign(venue_type='Journal').rename(columns={'journal':'venue'})]).drop_duplicates()
+
+    paper=paper.merge(org, on=['venue_type','venue'], how='left')
+
+    #============================================================================== ID DATATYPES
+    # Convert selected id columns to int64
+    frames={'author':author, 'conference':conference, 'hasAuthor':hasAuthor, 'journal':journal, 'paper':paper, 'review':review}
+    for df in frames:
+        cols=[i for i in frames[df].columns if i in ['author', 'organizer', 'paper', 'reviewer']]
+        if len(cols)>0:
+            print(f'Convert to int64: {df}')
+            for col in cols:
+                print('\t',col)
+                frames[df][col]=(frames[df][col]).astype('int64')
+
+    #============================================================================== AREA
+    area=read_csv('topic.csv', usecols=['community']).rename(columns={'community':'topicName'}).drop_duplicates().reset_index(drop=True)
+    area['area']='area-'+area.index.astype(str)
+
+    #============================================================================== HASTOPIC
+    frames={'paper':paper, 'journal':journal, 'volume':volume, 'conference':conference, 'proceeding':proceeding}
+    hasTopic=[]
+    for df in frames:
+        hasTopic.append(frames[df][[df]].rename(columns={df:'id'}).assign(typ=df))
+    hasTopic=pd.concat(hasTopic, ignore_index=True)
+    weights=None if topic_weights is None else area['topicName'].map(topic_weights).fillna(0).to_numpy()
+    hasTopic=assign_topics(rows(hasTopic.typ+':'+hasTopic.id.astype(str), 'topic'), hasTopic, area, topics, weights)
+
+    del org, published, submitted
+    gc.collect()
+
+    #============================================================================== CLEAN ALL DATAFRAMES
+    # General cLean up of all dfs
+    frames={'area':area, 'author':author, 'conference':conference, 'journal':journal, 'volume':volume,
+            'proceeding':proceeding, 'paper':paper, 'review':review, 'hasAuthor':hasAuthor, 'hasTopic':hasTopic}
+    for df in frames:
+        # replace nulls with None
+        frames[df]=frames[df].replace(np.nan, None)
+
+        # Make all date columns into datetime
+        dcols=[i for i in frames[df].columns if 'date' in i.lower() or i.endswith('_dt')]
+        for col in dcols:
+            frames[df][col]=pd.to_datetime(frames[df][col])
+
+    return frames
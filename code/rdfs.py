@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+"""
+Specialized RDFS materializer for the SDM schema.
+The TBOX only uses subClassOf, subPropertyOf, domain and range, so the class and property
+hierarchies are closed once and the ABOX entailments are derived in a single pass over the
+triples of each predicate, instead of iterating the generic owlrl rules to a fixpoint.
+Produces the same triples as owlrl.RDFSClosure.RDFS_Semantics(g,False,False,False).closure().
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+from collections import defaultdict
+from datetime import date, datetime
+from rdflib import Literal, RDF, RDFS
+from triples import collectors
+
+#=============================================================================#
+#                                HIERARCHY                                    #
+#=============================================================================#
+
+def add_inferred(g, triples):
+    'Add inferred triples to g, also counting the new ones in the statistics collectors (see stats.collect)'
+    triples=[t for t in set(triples) if t not in g]
+    g.addN((s, p, o, g) for s, p, o in triples)
+    for collector in collectors:
+        collector.addN((s, p, o, None) for s, p, o in triples)
+
+def edges(g, predicate):
+    """
+    Adjacency of a schema relation
+    Input: graph, relation (e.g. RDFS.subClassOf)
+    Output: dict subject -> set of objects
+    """
+    out=defaultdict(set)
+    for s, o in g.subject_objects(predicate):
+        out[s].add(o)
+    return out
+
+def transitive(adjacency):
+    """
+    Transitive (non-reflexive) closure of a relation
+    Input: dict node -> set of direct successors
+    Output: dict node -> set of nodes reachable with one or more steps
+    """
+    out={}
+    for node in adjacency:
+        seen=set()
+        stack=list(adjacency[node])
+        while stack:
+            n=stack.pop()
+            if n not in seen:
+                seen.add(n)
+                stack.extend(adjacency.get(n, ()))
+        out[node]=seen
+    return out
+
+class Schema:
+    """
+    Closed class and property hierarchies with the domain and range declarations of a TBOX
+    """
+    def __init__(self, g):
+        self.subclass=transitive(edges(g, RDFS.subClassOf))
+        self.subproperty=transitive(edges(g, RDFS.subPropertyOf))
+        self.domain=edges(g, RDFS.domain)
+        self.range=edges(g, RDFS.range)
+
+    def superclasses(self, c):
+        'Class and all its superclasses'
+        return self.subclass.get(c, set())|{c}
+
+    def superproperties(self, p):
+        'Property and all its superproperties'
+        return self.subproperty.get(p, set())|{p}
+
+#=============================================================================#
+#                              MATERIALIZATION                                #
+#=============================================================================#
+
+def value_key(lt):
+    """
+    Key grouping literals whose python values are equal (owlrl's hidden sameAs on literals)
+    e.g. "1"^^xsd:integer and "1.0"^^xsd:float, or a date and a pandas Timestamp at midnight.
+    Output: hashable key or None if the literal has no value
+    """
+    v=lt.value
+    if v is None:
+        return None
+    if isinstance(v, (bool, int, float)) or type(v).__name__=='Decimal':
+        return ('number', v)
+    if isinstance(v, datetime):
+        if hasattr(v, 'to_pydatetime') and v.tzinfo is None and v.time()==datetime.min.time():
+            return ('date', v.date())
+        return ('datetime', v)
+    if isinstance(v, date):
+        return ('date', v)
+    try:
+        hash(v)
+    except TypeError:
+        return None
+    return (type(v).__name__ if not isinstance(v, str) else 'str', v)
+
+def literal_copies(g):
+    """
+    Triples (s, p, lt2) for every (s, p, lt1) where lt1 and lt2 have the same value
+    """
+    groups=defaultdict(set)
+    for lt in set(o for o in g.objects() if isinstance(o, Literal)):
+        key=value_key(lt)
+        if key is not None:
+            groups[key].add(lt)
+    out=set()
+    for lts in groups.values():
+        if len(lts)>1:
+            for lt1 in lts:
+                for s, p in g.subject_predicates(lt1):
+                    out.update((s, p, lt2) for lt2 in lts if lt2 is not lt1)
+    return out
+
+# Rules of each closure profile, in the order their triples are counted
+PROFILES={
+    # Same triples as owlrl's RDFS closure
+    'full':['literals', 'rdfs7', 'rdfs2', 'rdfs3', 'rdfs9', 'rdfs4', 'rdfs6', 'rdfs11'],
+    # Only the entailments the queries use: class membership and super-properties.
+    # No literal copies, rdfs:Resource and literal typing, or property and hierarchy axioms
+    'lean':['rdfs7', 'rdfs2', 'rdfs3', 'rdfs9'],
+}
+
+# Rule -> description printed by materialize(verbose=True)
+RULES={
+    'literals':'copies between equal literals',
+    'rdfs7':'super-properties',
+    'rdfs2':'domain types',
+    'rdfs3':'range types',
+    'rdfs9':'superclass types',
+    'rdfs4':'rdfs:Resource types',
+    'rdfs6':'properties (rdf1, rdfs5, rdfs6)',
+    'rdfs11':'transitive subClassOf',
+}
+
+def materialize(g, schema=None, profile='full', verbose=False):
+    """
+    RDFS closure of g, added to g in place
+    Input:
+        g: graph with the TBOX and ABOX
+        schema: precomputed Schema (read from g by default)
+        profile: 'full' (same triples as owlrl) or 'lean' (see PROFILES)
+        verbose: print the number of triples added by each rule
+    Output: number of inferred triples
+    """
+    before=len(g)
+    schema=schema or Schema(g)
+    rules=PROFILES[profile]
+    lean='rdfs4' not in rules
+    added={}
+
+    def add(rule, triples):
+        'Add the triples of a rule that are not in g yet'
+        if rule in rules:
+            n=len(g)
+            add_inferred(g, triples)
+            added[rule]=added.get(rule, 0)+len(g)-n
+
+    # One-time rule: copy triples between literals with the same value
+    if 'literals' in rules:
+        add('literals', literal_copies(g))
+
+    new=defaultdict(set)
+    types=defaultdict(set)
+    properties={RDF.type, RDFS.subPropertyOf}
+    for p in set(g.predicates()):
+        pairs=list(g.subject_objects(p))
+        supers=schema.superproperties(p)
+        properties|=supers
+
+        # rdfs4a / rdfs4b: every node of the asserted graph is a resource
+        if not lean:
+            for s, o in pairs:
+                types['rdfs4'].add((s, RDFS.Resource))
+                types['rdfs4'].add((o, RDFS.Resource))
+
+        # rdfs7: super-properties
+        for q in supers-{p}:
+            new['rdfs7'].update((s, q, o) for s, o in pairs)
+
+        # rdfs2 / rdfs3: domain and range (the lean profile does not type literals)
+        for c in set().union(*(schema.domain.get(q, set()) for q in supers)):
+            types['rdfs2'].update((s, c) for s, _ in pairs)
+        for c in set().union(*(schema.range.get(q, set()) for q in supers)):
+            types['rdfs3'].update((o, c) for _, o in pairs if not (lean and isinstance(o, Literal)))
+
+        # asserted types
+        if RDF.type in supers:
+            types['rdf:type'].update(pairs)
+
+    # rdf1 / rdfs6 / rdfs5: used properties, reflexive and transitive subPropertyOf
+    if 'rdfs6' in rules:
+        for p in set().union(*(schema.superproperties(p) for p in properties)):
+            types['rdfs6'].add((p, RDF.Property))
+            new['rdfs6'].update((p, RDFS.subPropertyOf, q) for q in schema.superproperties(p))
+        for p, supers in schema.subproperty.items():
+            new['rdfs6'].update((p, RDFS.subPropertyOf, q) for q in supers)
+
+    # rdfs9: types are closed over the class hierarchy
+    superclasses={}
+    for rule, pairs in types.items():
+        new[rule].update((n, RDF.type, c) for n, c in pairs)
+        for n, c in pairs:
+            if c not in superclasses:
+                superclasses[c]=schema.superclasses(c)-{c}
+            new['rdfs9'].update((n, RDF.type, d) for d in superclasses[c])
+
+    # rdfs11: transitive subClassOf
+    if 'rdfs11' in rules:
+        for c, supers in schema.subclass.items():
+            new['rdfs11'].update((c, RDFS.subClassOf, d) for d in supers)
+
+    for rule in rules:
+        add(rule, new.get(rule, ()))
+    if verbose:
+        for rule in rules:
+            print(f'{rule:8} {RULES[rule]:32} {added.get(rule, 0):>10}')
+    return len(g)-before
+
+#=============================================================================#
+#                          INCREMENTAL MAINTENANCE                            #
+#=============================================================================#
+
+class Closure:
+    """
+    RDFS closure of a graph kept up to date under insertions and deletions of ABOX triples.
+    materialize() derives every inferred triple from a single asserted triple (or literal
+    copy) and the schema, so the rules are applied once per changed triple (semi-naive) and
+    every inferred triple counts the triples it is derived from: it is retracted when its
+    count drops to zero. The TBOX must not change between updates.
+    Attributes:
+        schema: Schema of the TBOX
+        asserted: set of asserted triples (TBOX and ABOX)
+        base: asserted triples and literal copies
+        support: dict inferred triple -> number of derivations
+    """
+    def __init__(self, g, schema=None):
+        self.schema=schema or Schema(g)
+        self.asserted=set(g)
+        self.rules={}
+
+        # Literal copies, grouped by the value of the literal
+        self.literals=defaultdict(set)
+        for s, p, o in self.asserted:
+            if isinstance(o, Literal) and value_key(o) is not None:
+                self.literals[o].add((s, p))
+        self.groups=defaultdict(set)
+        for lt in self.literals:
+            self.groups[value_key(lt)].add(lt)
+        self.copies={key: self.group_copies(key) for key in self.groups}
+        self.base=self.asserted.union(*self.copies.values())
+
+        # rdf1 / rdfs5 / rdfs6 / rdfs11 on the schema do not depend on the ABOX
+        schema=self.schema
+        axioms=set()
+        for p in set().union(*(schema.superproperties(q) for q in [RDF.type, RDFS.subPropertyOf])):
+            axioms.update((p, RDF.type, c) for c in schema.superclasses(RDF.Property))
+            axioms.update((p, RDFS.subPropertyOf, q) for q in schema.superproperties(p))
+        for p, supers in schema.subproperty.items():
+            axioms.update((p, RDFS.subPropertyOf, q) for q in supers)
+        for c, supers in schema.subclass.items():
+            axioms.update((c, RDFS.subClassOf, d) for d in supers)
+        self.support=dict.fromkeys(axioms, 1)
+        for t in self.base:
+            for c in self.consequences(t):
+                self.support[c]=self.support.get(c, 0)+1
+
+    def group_copies(self, key):
+        'Literal copies between the literals of a value group'
+        lts=self.groups.get(key, ())
+        if len(lts)<2:
+            return set()
+        return set((s, p, lt2) for lt1 in lts for s, p in self.literals[lt1] for lt2 in lts if lt2!=lt1)
+
+    def rule(self, p):
+        """
+        Entailments of the triples of a predicate (cached)
+        Output: (superproperties other than p, classes of the subject, classes of the object,
+                 p is a subproperty of rdf:type, property triples)
+        """
+        if p not in self.rules:
+            schema=self.schema
+            supers=schema.superproperties(p)
+            closed=lambda classes: set().union(*(schema.superclasses(c) for c in classes))
+            domain=closed({RDFS.Resource}.union(*(schema.domain.get(q, set()) for q in supers)))
+            range_=closed({RDFS.Resource}.union(*(schema.range.get(q, set()) for q in supers)))
+            axioms=set()
+            for q in supers:
+                axioms.update((q, RDF.type, c) for c in schema.superclasses(RDF.Property))
+                axioms.update((q, RDFS.subPropertyOf, r) for r in schema.superproperties(q))
+            self.rules[p]=(supers-{p}, domain, range_, RDF.type in supers, axioms)
+        return self.rules[p]
+
+    def consequences(self, t):
+        'Triples derived by materialize() from one asserted triple'
+        s, p, o = t
+        supers, domain, range_, typing, axioms = self.rule(p)
+        out=set(axioms)
+        out.update((s, q, o) for q in supers)
+        out.update((s, RDF.type, c) for c in domain)
+        out.update((o, RDF.type, c) for c in range_)
+        if typing:
+            out.update((s, RDF.type, c) for c in self.schema.superclasses(o))
+        return out
+
+    def __contains__(self, t):
+        return t in self.base or self.support.get(t, 0)>0
+
+    def __iter__(self):
+        yield from self.base
+        yield from (t for t, n in self.support.items() if n>0 and t not in self.base)
+
+    def __len__(self):
+        return len(self.base)+sum(1 for t, n in self.support.items() if n>0 and t not in self.base)
+
+    def materialize(self, g):
+        """
+        Add the closure to g (the graph the Closure was built from)
+        Output: number of inferred triples
+        """
+        before=len(g)
+        add_inferred(g, (t for t in self if t not in self.asserted))
+        return len(g)-before
+
+    def update(self, insert=(), delete=(), g=None):
+        """
+        Apply ABOX changes to the closure
+        Input:
+            insert, delete: triples added to and removed from the asserted graph
+            g: materialized graph to update in place (optional)
+        Output: (added, removed) sets of triples of the closure, asserted triples included
+        """
+        # A triple both deleted and inserted is kept
+        insert=set(insert)
+        delete=(set(delete)-insert)&self.asserted
+        insert-=self.asserted
+        self.asserted-=delete
+        self.asserted|=insert
+
+        # Literal copies only change in the value groups of the changed literals
+        keys=set()
+        for triples, add in [(delete, False), (insert, True)]:
+            for s, p, o in triples:
+                key=value_key(o) if isinstance(o, Literal) else None
+                if key is None:
+                    continue
+                keys.add(key)
+                if add:
+                    self.literals[o].add((s, p))
+                    self.groups[key].add(o)
+                else:
+                    self.literals[o].discard((s, p))
+                    if not self.literals[o]:
+                        del self.literals[o]
+                        self.groups[key].discard(o)
+        old_copies=set().union(*(self.copies.pop(key, set()) for key in keys))
+        for key in keys:
+            self.copies[key]=self.group_copies(key)
+            if not self.groups[key]:
+                del self.groups[key], self.copies[key]
+        new_copies=set().union(*(self.copies.get(key, set()) for key in keys))
+
+        def in_base(t):
+            o=t[2]
+            return t in self.asserted or (isinstance(o, Literal) and t in self.copies.get(value_key(o), ()))
+        plus=set(t for t in insert|new_copies if t not in self.base)
+        minus=set(t for t in delete|old_copies if t in self.base and not in_base(t))
+
+        # Semi-naive step: only the consequences of the changed base triples are counted
+        derived=[(t, self.consequences(t)) for t in plus|minus]
+        touched=plus|minus
+        for _, out in derived:
+            touched|=out
+        before={t: t in self for t in touched}
+        self.base-=minus
+        self.base|=plus
+        for t, out in derived:
+            step=1 if t in plus else -1
+            for c in out:
+                n=self.support.get(c, 0)+step
+                if n:
+                    self.support[c]=n
+                else:
+                    del self.support[c]
+
+        added=set(t for t, was in before.items() if not was and t in self)
+        removed=set(t for t, was in before.items() if was and t not in self)
+        if g is not None:
+            for t in removed:
+                g.remove(t)
+            g.addN((s, p, o, g) for s, p, o in added)
+        return added, removed
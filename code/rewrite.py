@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Query rewriting over the TBOX hierarchy, an alternative to materializing the RDFS closure.
+Every triple pattern of a query is replaced by the union of the patterns that entail it:
+    ?x rdf:type C   ->  ?x rdf:type D (D subclass of C), ?x p ?_ (p with domain D or a
+                        subproperty of one), ?_ p ?x (p with range D or a subproperty of one)
+    ?x P ?y         ->  ?x Q ?y (Q subproperty of P)
+so the rewritten query returns over the TBOX and ABOX (B1, B2, B3 outputs) the answers the
+original query returns over the materialized graph (B). Each union is wrapped in a
+SELECT DISTINCT of the pattern variables, because a triple entailed in several ways is
+stored once in the materialized graph.
+Patterns with a variable class or predicate, property paths and rdfs:Resource, literal
+and axiomatic entailments are not rewritten.
+Usage: python rewrite.py ../output/output_tbox.rdf ../query/query1.rq
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+import sys
+from collections import defaultdict
+from functools import reduce
+from rdflib import Graph, URIRef, Variable, RDF, RDFS
+from rdflib.plugins.sparql import prepareQuery
+from rdflib.plugins.sparql.algebra import (BGP, Join, Union, Project, ToMultiSet, traverse,
+                                           translateAlgebra, _traverseAgg, _addVars)
+from rdflib.plugins.sparql.parserutils import CompValue
+from rdflib.plugins.sparql.sparql import Query
+from rdfs import Schema
+
+#=============================================================================#
+#                                 REWRITER                                    #
+#=============================================================================#
+
+def inverse(closure):
+    'dict node -> set of nodes reaching it (inverse of rdfs.transitive)'
+    out=defaultdict(set)
+    for node, supers in closure.items():
+        for s in supers:
+            out[s].add(node)
+    return out
+
+def lazy_join(p1, p2):
+    """
+    Join evaluating p2 for each solution of p1, with its variables bound. rdflib joins a
+    SELECT DISTINCT by comparing every pair of solutions of both sides, but the unions only
+    have triple patterns, so they can be evaluated with the bindings instead.
+    """
+    node=Join(p1, p2)
+    node['lazy']=True
+    return node
+
+class Rewriter:
+    """
+    Rewrites SPARQL queries for a TBOX
+    Input: graph with the TBOX (or the TBOX and ABOX)
+    """
+    def __init__(self, tbox):
+        self.schema=Schema(tbox)
+        self.subclasses=inverse(self.schema.subclass)
+        self.subproperties=inverse(self.schema.subproperty)
+        self.domain_of=inverse(self.schema.domain)
+        self.range_of=inverse(self.schema.range)
+        self.fresh=0
+
+    def below(self, hierarchy, node):
+        'Node and all its subclasses or subproperties'
+        return hierarchy.get(node, set())|{node}
+
+    def variable(self):
+        'Fresh variable for the unused end of a domain or range pattern'
+        self.fresh+=1
+        return Variable(f'_rw{self.fresh}')
+
+    def alternatives(self, triple):
+        """
+        Patterns entailing a triple pattern
+        Output: list of triple patterns, None if the pattern is not rewritten
+        """
+        s, p, o = triple
+        if not isinstance(p, URIRef):
+            return None
+        if p==RDF.type:
+            if not isinstance(o, URIRef) or o==RDFS.Resource:
+                return None
+            classes=self.below(self.subclasses, o)
+            out=[(s, q, c) for q in sorted(self.below(self.subproperties, RDF.type)) for c in sorted(classes)]
+            for entails, position in [(self.domain_of, 0), (self.range_of, 2)]:
+                properties=set()
+                for c in classes:
+                    for q in entails.get(c, ()):
+                        properties|=self.below(self.subproperties, q)
+                for q in sorted(properties):
+                    out.append((s, q, self.variable()) if position==0 else (self.variable(), q, s))
+        else:
+            out=[(s, q, o) for q in sorted(self.below(self.subproperties, p))]
+        return out if len(out)>1 else None
+
+    def bgp(self, node):
+        'Join of the unchanged patterns of a BGP with the unions of the rewritten ones'
+        kept, parts = [], []
+        for triple in node.triples:
+            alts=self.alternatives(triple)
+            if alts is None:
+                kept.append(triple)
+                continue
+            union=reduce(Union, (BGP([t]) for t in alts))
+            variables=list(dict.fromkeys(x for x in triple if isinstance(x, Variable)))
+            parts.append(ToMultiSet(CompValue('Distinct', p=Project(union, variables))))
+        if not parts:
+            return node
+        return reduce(lazy_join, parts if not kept else [BGP(kept)]+parts)
+
+    def rewrite(self, query):
+        """
+        Rewritten query
+        Input: query text or rdflib prepared Query
+        Output: rdflib Query (g.query accepts it)
+        """
+        if isinstance(query, str):
+            query=prepareQuery(query)
+        visit=lambda n: self.bgp(n) if isinstance(n, CompValue) and n.name=='BGP' else None
+        algebra=traverse(query.algebra, visitPost=visit)
+        _traverseAgg(algebra, _addVars)
+        return Query(query.prologue, algebra)
+
+    def text(self, query):
+        'Rewritten query as SPARQL text (full IRIs)'
+        return translateAlgebra(self.rewrite(query))
+
+#=============================================================================#
+#                                   MAIN                                      #
+#=============================================================================#
+
+if __name__=='__main__':
+    rewriter=Rewriter(Graph().parse(sys.argv[1]))
+    for path in sys.argv[2:]:
+        with open(path) as f:
+            print(f'# {path}\n{rewriter.text(f.read())}\n')
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+Statistics of the generated graphs (VoID-style), for the query optimizer (optimize.py) and
+capacity planning.
+The statistics are collected while the triples are emitted: inside collect(stats), every
+column of triples written by triples.emit is also counted by stats (in the worker processes
+too, see parallel.py), so the graph is not scanned again. Terms are counted as 64-bit hashes,
+deduplicated when the statistics are computed.
+Each output gets <output>.stats.json (per predicate: triples, distinct subjects and objects,
+literal datatypes and the most frequent literal values; instances per class) and
+<output>.void.ttl (the same counts as VoID property and class partitions).
+For the inferred graph, the triples added by the RDFS materializer are counted as it adds them,
+so the statistics describe the written file. Triples with a literal subject (generalized triples
+of the closure) are not counted, as no output format writes them.
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+import json
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from rdflib import Graph, Literal, URIRef, BNode, RDF, XSD
+from rdflib.namespace import VOID
+from triples import collectors
+
+# Most frequent literal values kept per predicate
+TOP_VALUES=20
+# Distinct literal values tracked per predicate before the rare ones are dropped
+MAX_VALUES=10000
+
+#=============================================================================#
+#                               STATISTICS                                    #
+#=============================================================================#
+
+def hashes(terms):
+    """
+    64-bit hashes of a column of terms (the same in every process)
+    Output: uint64 numpy array
+    """
+    seen={}
+    def key(term):
+        k=id(term)
+        if k not in seen:
+            seen[k]=term.n3() if isinstance(term, Literal) else str(term)
+        return seen[k]
+    return pd.util.hash_array(np.array([key(t) for t in terms], dtype=object))
+
+def distinct(chunks):
+    'Distinct hashes of a list of arrays'
+    return np.unique(np.concatenate(chunks)) if chunks else np.empty(0, dtype=np.uint64)
+
+class Statistics:
+    """
+    Per-predicate and per-class statistics of a graph, with the add_columns/addN interface
+    of a graph sink
+    Attributes (computed by freeze):
+        triples: number of distinct triples
+        predicates: dict predicate -> {'triples', 'subjects', 'objects', 'datatypes', 'values'}
+        classes: dict class -> number of instances
+    """
+    def __init__(self):
+        self.triples=0
+        self.predicates={}
+        self.classes={}
+        self._subjects=defaultdict(list)
+        self._objects=defaultdict(list)
+        self._pairs=defaultdict(list)
+        self._instances=defaultdict(list)
+        self._datatypes=defaultdict(Counter)
+        self._values=defaultdict(Counter)
+
+    #==========================================================================  COUNTING
+    def add_columns(self, s, p, o):
+        'Count triples given as three aligned columns of terms (not those with a literal subject)'
+        s, p, o = (np.asarray(x, dtype=object) for x in (s, p, o))
+        keep=np.fromiter((not isinstance(x, Literal) for x in s), dtype=bool, count=len(s))
+        if not keep.all():
+            s, p, o = s[keep], p[keep], o[keep]
+        if not len(s):
+            return
+        hs, ho = hashes(s), hashes(o)
+        codes, predicates = pd.factorize(p)
+        for i, predicate in enumerate(predicates):
+            mask=codes==i
+            self._subjects[predicate].append(hs[mask])
+            self._objects[predicate].append(ho[mask])
+            self._pairs[predicate].append(hs[mask]*np.uint64(0x9E3779B97F4A7C15)^ho[mask])
+            if predicate==RDF.type:
+                types, classes = pd.factorize(o[mask])
+                for j, c in enumerate(classes):
+                    self._instances[c].append(hs[mask][types==j])
+            literals=[x for x in o[mask] if isinstance(x, Literal) and x.language is None]
+            if literals:
+                self._datatypes[predicate].update(x.datatype or XSD.string for x in literals)
+                values=self._values[predicate]
+                values.update(map(str, literals))
+                if len(values)>MAX_VALUES:
+                    self._values[predicate]=Counter(dict(values.most_common(MAX_VALUES//10)))
+            if len(self._pairs[predicate])>64:
+                self.compact(predicate)
+        self.predicates={}
+
+    def compact(self, predicate):
+        'Deduplicate the hashes collected for a predicate'
+        for store in (self._subjects, self._objects, self._pairs):
+            store[predicate]=[distinct(store[predicate])]
+
+    def addN(self, quads):
+        quads=list(quads)
+        if quads:
+            s, p, o, c = zip(*quads)
+            self.add_columns(s, p, o)
+
+    def add(self, triple):
+        self.addN([(*triple, None)])
+
+    def merge(self, other):
+        'Add the counts of another Statistics (e.g. of a worker process)'
+        for mine, theirs in [(self._subjects, other._subjects), (self._objects, other._objects),
+                             (self._pairs, other._pairs), (self._instances, other._instances)]:
+            for key, chunks in theirs.items():
+                mine[key].extend(chunks)
+        for p in list(self._pairs):
+            if len(self._pairs[p])>64:
+                self.compact(p)
+        for mine, theirs in [(self._datatypes, other._datatypes), (self._values, other._values)]:
+            for key, counter in theirs.items():
+                mine[key].update(counter)
+        self.predicates={}
+        return self
+
+    @classmethod
+    def of(cls, g):
+        'Statistics of the triples of a graph (scanned, for graphs not built by emit)'
+        stats=cls()
+        stats.addN((s, p, o, None) for s, p, o in g)
+        return stats.freeze()
+
+    #==========================================================================  RESULTS
+    def freeze(self):
+        'Compute the statistics of the counted triples'
+        subjects, objects, pairs, instances = self._subjects, self._objects, self._pairs, self._instances
+        self.predicates={}
+        for p in pairs:
+            values=self._values.get(p, Counter())
+            self.predicates[p]={'triples':len(distinct(pairs[p])), 'subjects':len(distinct(subjects[p])),
+                                'objects':len(distinct(objects[p])), 'datatypes':dict(self._datatypes.get(p, {})),
+                                'values':dict(values.most_common(TOP_VALUES))}
+        self.triples=sum(v['triples'] for v in self.predicates.values())
+        self.classes={c: len(distinct(chunks)) for c, chunks in instances.items()}
+        return self
+
+    #==========================================================================  FILES
+    def save(self, path):
+        'Write the statistics as JSON'
+        if not self.predicates:
+            self.freeze()
+        data={'triples':self.triples,
+              'predicates':{str(p): {**v, 'datatypes':{str(d): n for d, n in v['datatypes'].items()}}
+                            for p, v in self.predicates.items()},
+              'classes':{str(c): n for c, n in self.classes.items()}}
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=1)
+
+    @classmethod
+    def load(cls, path):
+        'Statistics written by save'
+        with open(path) as f:
+            data=json.load(f)
+        stats=cls()
+        stats.triples=data['triples']
+        stats.predicates={URIRef(p): {**v, 'datatypes':{URIRef(d): n for d, n in v['datatypes'].items()}}
+                          for p, v in data['predicates'].items()}
+        stats.classes={URIRef(c): n for c, n in data['classes'].items()}
+        return stats
+
+    @classmethod
+    def union(cls, parts):
+        """
+        Statistics of the union of graphs with disjoint triples, from their statistics (e.g. loaded
+        ones). The distinct subjects and objects of a predicate found in several graphs are added
+        up, so they are an upper bound.
+        Input: list of frozen Statistics
+        """
+        stats=cls()
+        for part in parts:
+            stats.triples+=part.triples
+            for p, v in part.predicates.items():
+                mine=stats.predicates.setdefault(p, {'triples':0, 'subjects':0, 'objects':0, 'datatypes':{}, 'values':{}})
+                for key in ('triples', 'subjects', 'objects'):
+                    mine[key]+=v[key]
+                mine['datatypes']=dict(Counter(mine['datatypes'])+Counter(v['datatypes']))
+                mine['values']=dict((Counter(mine['values'])+Counter(v['values'])).most_common(TOP_VALUES))
+            for c, n in part.classes.items():
+                stats.classes[c]=stats.classes.get(c, 0)+n
+        return stats
+
+    def void(self, dataset):
+        """
+        VoID description of the statistics
+        Input: URI of the dataset (e.g. sdm:abox)
+        Output: rdflib Graph
+        """
+        if not self.predicates:
+            self.freeze()
+        g=Graph()
+        g.bind('void', VOID)
+        g.add((dataset, RDF.type, VOID.Dataset))
+        g.add((dataset, VOID.triples, Literal(self.triples)))
+        g.add((dataset, VOID.properties, Literal(len(self.predicates))))
+        g.add((dataset, VOID.classes, Literal(len(self.classes))))
+        for p, v in sorted(self.predicates.items()):
+            node=BNode()
+            g.add((dataset, VOID.propertyPartition, node))
+            g.add((node, VOID.property, p))
+            g.add((node, VOID.triples, Literal(v['triples'])))
+            g.add((node, VOID.distinctSubjects, Literal(v['subjects'])))
+            g.add((node, VOID.distinctObjects, Literal(v['objects'])))
+        for c, n in sorted(self.classes.items()):
+            node=BNode()
+            g.add((dataset, VOID.classPartition, node))
+            g.add((node, VOID['class'], c))
+            g.add((node, VOID.entities, Literal(n)))
+        return g
+
+@contextmanager
+def collect(stats):
+    'Count the triples emitted by triples.emit in stats'
+    collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        collectors.remove(stats)
+
+def stats_path(name):
+    'Statistics file of an output, e.g. output_graph_inference.stats.json'
+    return f'{name}.stats.json'
+
+def save_statistics(stats, name):
+    """
+    Write the statistics of an output (<name>.stats.json and <name>.void.ttl)
+    Input: Statistics, output name (e.g. 'output_abox')
+    """
+    from export import graph_name
+    stats.freeze()
+    stats.save(stats_path(name))
+    stats.void(graph_name(name)).serialize(destination=f'{name}.void.ttl', format='turtle')
+    print(f'Statistics: {stats.triples} triples, {len(stats.predicates)} properties, {len(stats.classes)} classes')
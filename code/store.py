@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Compact in-memory triple store for the ABOX generator.
+Terms are dictionary-encoded to integer ids and the triples are kept as NumPy int32
+subject/predicate/object columns, deduplicated by sorting. The store has the add/addN
+interface of rdflib.Graph, so it can replace g in the converters, and is only converted to
+an rdflib Graph (or written as N-Triples) when it is exported.
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+import numpy as np
+from rdflib import Graph
+from triples import NTriplesWriter
+
+#=============================================================================#
+#                                  STORE                                      #
+#=============================================================================#
+
+class TripleStore:
+    """
+    Dictionary-encoded triple store
+    Attributes:
+        terms: list of terms, the id of a term is its position
+        spo: (n, 3) int32 array of triples (deduplicated and sorted when compacted)
+    """
+    def __init__(self):
+        self.terms=[]
+        self.ids={}
+        self.namespaces={}
+        self._spo=np.empty((0, 3), dtype=np.int32)
+        self._chunks=[]
+
+    def bind(self, prefix, namespace, *args, **kwargs):
+        'Prefixes used when the store is serialized'
+        self.namespaces[prefix]=namespace
+
+    #==========================================================================  ENCODING
+    def encode(self, terms):
+        """
+        Ids of a column of terms, adding the new terms to the dictionary
+        Input: sequence of rdflib terms
+        Output: int32 numpy array
+        """
+        # Terms are compared with rdflib equality (pandas would compare Literals as plain strings)
+        ids, terms_ = self.ids, self.terms
+        seen={}
+        def tid(term):
+            key=id(term)
+            if key not in seen:
+                i=ids.get(term)
+                if i is None:
+                    i=ids[term]=len(terms_)
+                    terms_.append(term)
+                seen[key]=i
+            return seen[key]
+        return np.fromiter(map(tid, terms), dtype=np.int32, count=len(terms))
+
+    def decode(self, ids):
+        'Terms of an array of ids'
+        return np.array(self.terms, dtype=object)[ids]
+
+    def id(self, term):
+        'Id of a term, None if it is not in the store'
+        return self.ids.get(term)
+
+    #==========================================================================  ADDING
+    def add_columns(self, s, p, o):
+        """
+        Add triples given as three aligned columns of terms (fast path used by triples.emit)
+        """
+        if len(s):
+            self._chunks.append(np.column_stack([self.encode(s), self.encode(p), self.encode(o)]))
+
+    def addN(self, quads):
+        quads=list(quads)
+        if quads:
+            s, p, o, c = zip(*quads)
+            self.add_columns(s, p, o)
+
+    def add(self, triple):
+        self.addN([(*triple, None)])
+
+    def parse(self, source, format='nt'):
+        'Add the triples of a file'
+        g=Graph().parse(source, format=format)
+        self.addN((s, p, o, None) for s, p, o in g)
+        return self
+
+    #==========================================================================  TRIPLES
+    @property
+    def spo(self):
+        'Deduplicated and sorted triples (pending chunks are merged on access)'
+        if self._chunks:
+            self._spo=np.unique(np.concatenate([self._spo]+self._chunks), axis=0)
+            self._chunks=[]
+        return self._spo
+
+    def __len__(self):
+        return len(self.spo)
+
+    def __iter__(self):
+        terms=self.terms
+        for s, p, o in self.spo:
+            yield terms[s], terms[p], terms[o]
+
+    def triples(self, pattern):
+        """
+        Triples matching a (s, p, o) pattern, None being a wildcard
+        """
+        spo=self.spo
+        mask=np.ones(len(spo), dtype=bool)
+        for i, term in enumerate(pattern):
+            if term is not None:
+                tid=self.ids.get(term)
+                if tid is None:
+                    return
+                mask&=spo[:, i]==tid
+        terms=self.terms
+        for s, p, o in spo[mask]:
+            yield terms[s], terms[p], terms[o]
+
+    def counts(self, position=1):
+        """
+        Number of triples per term in one position (0 subject, 1 predicate, 2 object)
+        Output: dict term -> count
+        """
+        ids, n = np.unique(self.spo[:, position], return_counts=True)
+        return dict(zip(self.decode(ids), n.tolist()))
+
+    #==========================================================================  EXPORT
+    def to_graph(self, g=None):
+        'rdflib Graph with the triples of the store'
+        g=Graph() if g is None else g
+        for prefix, namespace in self.namespaces.items():
+            g.bind(prefix, namespace)
+        g.addN((s, p, o, g) for s, p, o in self)
+        return g
+
+    def serialize(self, destination, format='xml'):
+        """
+        Write the store. N-Triples are written directly, other formats through an rdflib Graph
+        """
+        if format in ('nt', 'ntriples'):
+            with NTriplesWriter(destination) as w:
+                w.addN((s, p, o, None) for s, p, o in self)
+        else:
+            self.to_graph().serialize(destination=destination, format=format)
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+Batched generators for the synthetic fields added during data preparation.
+Columns are produced in bulk with NumPy instead of one Faker/random call per row. Faker is
+only used to pre-draw small vocabularies (countries, companies, sentences) which are then
+sampled, so the output stays reproducible from the seed.
+The generators take a numpy Generator or a Keyed source, which draws the values of each row
+from a hash of the row's key (e.g. the author id) and the seed: the values of an entity do not
+depend on the other rows, so editing one row of the csv files only changes that row's values.
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+import numpy as np
+import pandas as pd
+
+# Last possible date of dates(), fixed so the output does not depend on the day it is generated
+LAST_DATE='2022-12-31'
+# Odd 64-bit constant separating the draws of a Keyed source
+GOLDEN=np.uint64(0x9E3779B97F4A7C15)
+
+#=============================================================================#
+#                                FUNCTIONS                                    #
+#=============================================================================#
+
+def mix(x):
+    'splitmix64 finalizer of a uint64 array (a well-spread 64-bit hash of each value)'
+    with np.errstate(over='ignore'):
+        x=(x^(x>>np.uint64(30)))*np.uint64(0xBF58476D1CE4E5B9)
+        x=(x^(x>>np.uint64(27)))*np.uint64(0x94D049BB133111EB)
+        return x^(x>>np.uint64(31))
+
+def stable_hash(values):
+    'Hashes of values (by their string) that are the same in every run, unlike hash()'
+    return pd.util.hash_array(np.asarray(pd.Series(values, dtype=object).astype(str), dtype=object))
+
+class Keyed:
+    """
+    Random source with the integers/random/choice interface of a numpy Generator, for columns
+    of len(keys) rows whose values are drawn from a hash of each row's key, the seed and the
+    field name. Scalar draws (e.g. the seed of a Faker vocabulary) only depend on the seed and
+    the field name.
+    Input: seed, keys of the rows (e.g. author ids), field name (e.g. 'birthdate')
+    """
+    def __init__(self, seed, keys, name):
+        self.salt=stable_hash([f'{seed}:{name}'])
+        self.base=mix(stable_hash(keys)^self.salt)
+        self.draws=0
+
+    def bits(self, size):
+        'Random uint64: one per call (size None), per row (size n) or per row and column (size (n, k))'
+        self.draws+=1
+        with np.errstate(over='ignore'):
+            if size is None:
+                return mix(self.salt+GOLDEN*np.uint64(self.draws))[0]
+            shape=(size,) if np.ndim(size)==0 else tuple(size)
+            if shape[0]!=len(self.base):
+                raise ValueError(f'Keyed source of {len(self.base)} rows asked for {shape[0]} values')
+            columns=np.arange(int(np.prod(shape[1:], dtype=int)), dtype=np.uint64)
+            offsets=GOLDEN*(np.uint64(self.draws)<<np.uint64(32)|columns)
+            return mix(self.base[:, None]+offsets).reshape(shape)
+
+    def random(self, size=None):
+        'Uniform floats in [0, 1)'
+        return (self.bits(size)>>np.uint64(11))*2.0**-53
+
+    def integers(self, low, high=None, size=None):
+        'Uniform integers in [low, high)'
+        low, high = (0, low) if high is None else (low, high)
+        values=low+np.floor(self.random(size)*(high-low)).astype(np.int64)
+        return int(values) if size is None else values
+
+    def choice(self, a, size=None, p=None):
+        'Elements of a (or range(a)), uniform or with probabilities p'
+        a=np.arange(a) if np.ndim(a)==0 else np.asarray(a)
+        u=self.random(size)
+        if p is None:
+            index=np.floor(u*len(a)).astype(np.int64)
+        else:
+            index=np.minimum(np.searchsorted(np.cumsum(p), u, side='right'), len(a)-1)
+        return a[index]
+
+    def ranking(self, key):
+        'Random order of the rows for a key (the same for a row whatever the other rows are)'
+        with np.errstate(over='ignore'):
+            return np.argsort(mix(self.base^stable_hash([key])), kind='stable')
+
+def vocabulary(fake, rng, provider, size):
+    """
+    Pre-draw values from a Faker provider, seeding Faker from rng
+    Input: Faker object, numpy Generator, provider name (e.g. 'country'), number of values
+    Output: numpy array of unique values
+    """
+    fake.seed_instance(int(rng.integers(2**31)))
+    draw=getattr(fake, provider)
+    return np.unique(np.array([draw() for i in range(size)], dtype=object))
+
+def sample(fake, rng, provider, n, size=1000):
+    """
+    n values of a Faker provider, sampled from a vocabulary of at most size values
+    (drawn whatever n is, so that the values of a row do not depend on the number of rows)
+    """
+    return rng.choice(vocabulary(fake, rng, provider, size), n)
+
+def dates(rng, n, start='1970-01-01', end=LAST_DATE):
+    """
+    Uniform random dates as 'YYYY-MM-DD' strings (same format as fake.date())
+    Input: numpy Generator, number of dates, first and last possible date
+    Output: numpy array of strings
+    """
+    start=np.datetime64(start, 'D')
+    end=np.datetime64(end, 'D')
+    days=rng.integers(0, (end-start).astype(int)+1, n)
+    return (start+days).astype(str)
+
+def paragraphs(fake, rng, n, sentences=3, size=2000):
+    """
+    Abstract-like paragraphs made of sentences sampled from a Faker vocabulary
+    """
+    out=sample(fake, rng, 'sentence', n, size).astype(str)
+    for i in range(sentences-1):
+        out=np.char.add(np.char.add(out, ' '), sample(fake, rng, 'sentence', n, size).astype(str))
+    return out
+
+def dois(rng, n):
+    """
+    DOIs with the same shape as f'http://doi.org/{fake.iana_id()}/{fake.ipv4()}'
+    """
+    iana=pd.Series(rng.integers(1, 8888889, n)).astype(str)
+    ip=pd.DataFrame(rng.integers(0, 256, (n, 4))).astype(str)
+    return ('http://doi.org/'+iana+'/'+ip[0]+'.'+ip[1]+'.'+ip[2]+'.'+ip[3]).to_numpy()
+
+def ssns(rng, n):
+    """
+    Identifiers with the same shape as fake.ssn() ('ddd-dd-dddd'), used for missing ISSNs
+    """
+    parts=[np.char.zfill(rng.integers(lo, hi, n).astype(str), width)
+           for lo, hi, width in [(1, 900, 3), (1, 100, 2), (1, 10000, 4)]]
+    return np.char.add(np.char.add(np.char.add(np.char.add(parts[0], '-'), parts[1]), '-'), parts[2])
+
+def dates_between(rng, start, end):
+    """
+    Uniform random dates between two date columns (both included), like fake.date_between_dates
+    drawn for all rows at once. Inverted bounds are swapped, a missing bound is replaced by
+    the other one and rows with both bounds missing stay NaT.
+    Input: numpy Generator, start and end columns (anything pd.to_datetime accepts)
+    Output: numpy datetime64 array
+    """
+    start=pd.to_datetime(pd.Series(start)).to_numpy().astype('datetime64[D]')
+    end=pd.to_datetime(pd.Series(end)).to_numpy().astype('datetime64[D]')
+    start, end = np.where(np.isnat(start), end, start), np.where(np.isnat(end), start, end)
+    start, end = np.minimum(start, end), np.maximum(start, end)
+    span=np.where(np.isnat(start), 0, (end-start).astype('int64'))
+    offset=np.floor(rng.random(len(span))*(span+1)).astype('int64')
+    return (start+offset).astype('datetime64[ns]')
+
+def venue_authors(paper, hasAuthor):
+    """
+    Index of the authors that have a paper in each venue, built with a single join
+    Input: paper dataframe (venue_type, venue, paper), hasAuthor dataframe (paper, author)
+    Output: dict (venue_type, venue) -> set of author ids
+    """
+    pairs=paper[['venue_type','venue','paper']].merge(hasAuthor[['paper','author']], on='paper')
+    return pairs.groupby(['venue_type','venue'])['author'].agg(set).to_dict()
+
+def pick_excluding(rng, pool, excluded, key):
+    """
+    Random element of pool that is not in excluded: the first one in the random order of the
+    pool for key (rendezvous hashing, so adding or removing other candidates rarely changes it)
+    Input: Keyed source over the pool, numpy array of candidates, set of excluded candidates, key
+           of the pick (e.g. the venue)
+    Output: candidate, or None if every candidate is excluded
+    """
+    for candidate in pool[rng.ranking(key)]:
+        if candidate not in excluded:
+            return candidate
+    return None
+
+def assign_topics(rng, df, area, topics=1, weights=None):
+    """
+    Random research areas for every row of df.
+    Areas are drawn as integer codes in one call and joined to their topic names by position.
+    Input:
+        rng: numpy Generator
+        df: rows to tag
+        area: dataframe with area and topicName columns
+        topics: number of distinct areas per row (rows are repeated once per area)
+        weights: optional weight of each area (aligned with area.area.unique())
+    Output: df with area and topicName columns
+    Raises ValueError if there are fewer areas with a non-zero weight than topics per row
+    """
+    area=area.drop_duplicates('area')
+    areas=area['area'].to_numpy()
+    names=area['topicName'].to_numpy()
+    if weights is not None and len(weights)!=len(areas):
+        raise ValueError(f'{len(weights)} weights given for {len(areas)} areas')
+    p=None if weights is None else np.asarray(weights, dtype=float)/np.sum(weights)
+    candidates=len(areas) if p is None else np.count_nonzero(p)
+    if not 1<=topics<=candidates:
+        raise ValueError(f'Cannot assign {topics} distinct topics per row from {candidates} areas'
+                         +('' if p is None else ' with a non-zero weight'))
+    if topics==1:
+        codes=rng.choice(len(areas), len(df), p=p)
+    else:
+        # Top-k of random keys gives distinct areas per row (weighted: Efraimidis-Spirakis keys u**(1/w))
+        keys=rng.random((len(df), len(areas)))
+        if p is not None:
+            keys=keys**(1/np.where(p>0, p, np.nan))
+            keys=np.nan_to_num(keys, nan=-1)
+        codes=np.argsort(-keys, axis=1)[:, :topics].ravel()
+    out=df.loc[df.index.repeat(topics)].reset_index(drop=True)
+    out['area']=areas[codes]
+    out['topicName']=names[codes]
+    return out
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Parameterized query templates.
+A template is a query of ../query/templates whose $ variables are parameters, e.g. $authorName
+and $topicName in query4.rq. It is parsed, rewritten and optimized once (the parameters are
+planned as bound) and then run with new values as initial bindings, so each request only
+evaluates the compiled plan. The compiled templates are cached by template text.
+Usage:
+    python templates.py ../output query4 authorName="Yunpeng Liu" topicName=Database
+    python templates.py ../output query2_case2 class="<http://example.org/sdm#Chair>"
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+import re, sys
+from rdflib import Literal, URIRef, Variable
+from rdflib.term import Node
+from rdflib.plugins.sparql.algebra import traverse
+from rdflib.plugins.sparql.parserutils import CompValue
+from workload import queries, load_layout
+from tbox import datatypes
+
+TEMPLATE_FOLDER='../query/templates'
+
+# Datatype of each data property (RDFS.range in the TBOX)
+DATATYPES=datatypes()
+
+#=============================================================================#
+#                                TEMPLATES                                    #
+#=============================================================================#
+
+def parameters(text):
+    'Names of the $ variables of a template, in order of appearance'
+    return list(dict.fromkeys(re.findall(r'\$(\w+)', text)))
+
+class Template:
+    """
+    Compiled template
+    Input: template text, graph it runs on, function (text, bound variables) -> prepared query
+    """
+    def __init__(self, text, g, prepare):
+        self.text=text
+        self.parameters=parameters(text)
+        self.query=prepare(text, self.parameters)
+        # Plain values are typed with the range of the data property they are used with
+        self.datatypes={}
+        def visit(node):
+            if isinstance(node, CompValue) and node.name=='BGP':
+                for s, p, o in node.triples:
+                    if isinstance(o, Variable) and str(o) in self.parameters and p in DATATYPES:
+                        self.datatypes.setdefault(str(o), DATATYPES[p])
+        traverse(self.query.algebra, visitPre=visit)
+
+    def bindings(self, values):
+        """
+        Initial bindings of a run
+        Input: dict parameter -> rdflib term or python value
+        """
+        missing=set(self.parameters)-set(values)
+        if missing:
+            raise ValueError(f'Missing template parameters: {", ".join(sorted(missing))}')
+        return {k: v if isinstance(v, Node) else Literal(v, datatype=self.datatypes.get(k))
+                for k, v in values.items()}
+
+class Templates:
+    """
+    Cache of the compiled templates of a graph
+    Input: graph and function preparing its queries (see workload.load_layout)
+    """
+    def __init__(self, g, prepare):
+        self.g=g
+        self.prepare=prepare
+        self.cache={}
+
+    def compile(self, text):
+        'Compiled template, compiled on first use'
+        if text not in self.cache:
+            self.cache[text]=Template(text, self.g, self.prepare)
+        return self.cache[text]
+
+    def run(self, text, **values):
+        'Result of a template with values for its parameters'
+        template=self.compile(text)
+        return self.g.query(template.query, initBindings=template.bindings(values))
+
+#=============================================================================#
+#                                   MAIN                                      #
+#=============================================================================#
+
+if __name__=='__main__':
+    folder, name = sys.argv[1], sys.argv[2]
+    # name=value, or name=<uri> for a node
+    values={k: URIRef(v[1:-1]) if v.startswith('<') else v for k, v in (arg.split('=', 1) for arg in sys.argv[3:])}
+    g, prepare, seconds = load_layout(folder, 'materialized')
+    result=Templates(g, prepare).run(queries(TEMPLATE_FOLDER)[name], **values)
+    for row in result:
+        print(*row)
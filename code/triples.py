@@ -0,0 +1,440 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar triple emission engine used by the ABOX converters.
+A converter is described as a list of (subject, predicate, object[, where]) specs.
+Each spec is resolved once for the whole dataframe (vectorized URI/literal construction)
+and the resulting triples are added in bulk with addN, instead of walking rows with iterrows().
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+import os
+import re
+import gzip
+import shutil
+from itertools import islice
+from collections import namedtuple, OrderedDict
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from rdflib import Namespace, URIRef, Literal, XSD
+from rdflib.term import Node, BNode
+try:
+    import zstandard
+except ImportError:
+    zstandard=None
+
+sdm = Namespace('http://example.org/sdm#')
+
+# Statistics counting the emitted triples (stats.collect)
+collectors=[]
+
+#=============================================================================#
+#                                 INTERNING                                   #
+#=============================================================================#
+
+class TermPool:
+    """
+    Bounded interning cache for URIs and literals shared by all converters, so a node that
+    appears in several columns (e.g. Author_1 as author, reviewer and organizer) or in many rows
+    (e.g. "Female") is created once. The least recently used nodes are dropped when it is full.
+    Input: maximum number of nodes kept
+    """
+    def __init__(self, maxsize=1<<20):
+        self.maxsize=maxsize
+        self.requests=0
+        self.created=0
+        self._nodes=OrderedDict()
+
+    def column(self, keys, factory, kind=None):
+        """
+        Interned nodes for a column
+        Input:
+            keys: pandas Series of hashable keys (URI strings, lexical forms)
+            factory: function key -> node, called for keys not in the pool
+            kind: namespace of the keys (e.g. the datatype of lexical forms)
+        Output: numpy object array
+        """
+        pool=self._nodes
+        nodes={}
+        for key in keys.unique():
+            node=pool.get((kind, key))
+            if node is None:
+                node=factory(key)
+                self.created+=1
+                pool[(kind, key)]=node
+                if len(pool)>self.maxsize:
+                    pool.popitem(last=False)
+            else:
+                pool.move_to_end((kind, key))
+            nodes[key]=node
+        self.requests+=len(keys)
+        return keys.map(nodes).to_numpy(dtype=object)
+
+    def stats(self):
+        'Counters of the pool'
+        hits=self.requests-self.created
+        return {'requests':self.requests, 'created':self.created, 'size':len(self._nodes),
+                'hit_rate':round(hits/self.requests, 4) if self.requests else 0.0}
+
+# Pool used by resolve
+pool=TermPool()
+
+#=============================================================================#
+#                                  VALUES                                     #
+#=============================================================================#
+
+def prepareValue(row, uri=sdm):
+    """
+    Function that prepares the values to be added to the graph as a URI or Literal
+    source: https://wiki.uib.no/info216/index.php/Python_Examples#RDF_programming_with_RDFlib_.28Lab_2.29
+    Input: row value
+    Output: Converted URI or literal
+    """
+    if row == None:  # none type
+        value = Literal(row)
+    elif (isinstance(row, str) and re.match(r'\d{4}-\d{2}-\d{2}', row)) or isinstance(row, datetime):  # date
+        value = Literal(row, datatype=XSD.date)
+    elif isinstance(row, bool):  # boolean value (true / false)
+        value = Literal(row, datatype=XSD.boolean)
+    elif isinstance(row, int):  # integer
+        value = Literal(row, datatype=XSD.integer)
+    elif isinstance(row, str):  # string
+        value = Literal(row, datatype=XSD.string)
+    elif isinstance(row, float):  # float
+        value = Literal(row, datatype=XSD.float)
+    return value
+
+def lexical(values, datatype):
+    """
+    Lexical forms of a column for an XSD datatype, computed for the whole column at once
+    Input: pandas Series, datatype (XSD.date, XSD.integer, XSD.float, XSD.boolean, XSD.string)
+    Output: Series of strings, NaN where the value is missing or cannot be converted
+    """
+    values=values.where(values.notna())
+    if datatype==XSD.date:
+        return pd.to_datetime(values, errors='coerce').dt.strftime('%Y-%m-%d')
+    if datatype==XSD.integer:
+        numbers=pd.to_numeric(values, errors='coerce')
+        whole=numbers.notna()&(numbers==numbers.round())
+        return numbers.where(whole, 0).astype('int64').astype(str).where(whole)
+    if datatype in (XSD.float, XSD.double, XSD.decimal):
+        numbers=pd.to_numeric(values, errors='coerce').astype(float)
+        return numbers.astype(str).where(numbers.notna())
+    if datatype==XSD.boolean:
+        return values.map({True:'true', False:'false', 1:'true', 0:'false'})
+    return values.astype(str).where(values.notna())
+
+def typed_literals(values, datatype):
+    """
+    Literals of a column typed with the declared datatype (e.g. the RDFS.range of the property).
+    Values that do not fit the datatype keep the type guessed by prepareValue.
+    Input: pandas Series, datatype
+    Output: numpy object array
+    """
+    lex=lexical(values, datatype)
+    out=np.empty(len(values), dtype=object)
+    ok=lex.notna().to_numpy()
+    # One Literal per distinct lexical form, shared by the rows that have it
+    out[ok]=pool.column(lex[ok], lambda i: Literal(i, datatype=datatype), datatype)
+    out[~ok]=[prepareValue(i) for i in values[~ok]]
+    return out
+
+#=============================================================================#
+#                                  SPECS                                      #
+#=============================================================================#
+
+# URIs made of sdm + prefix + id column. The prefix is either a string or a (column, {value: prefix}) pair
+Ref = namedtuple('Ref', ['prefix', 'col', 'spaces'])
+# Literals built from a column, typed with datatype when it is given
+Lit = namedtuple('Lit', ['col', 'datatype'])
+# Nodes looked up from a column value, e.g. the rdf:type of a paper from its type
+Mapped = namedtuple('Mapped', ['col', 'items'])
+
+def ref(prefix, col, spaces=False):
+    """
+    URI spec: sdm + prefix + str(id).
+    Input:
+        prefix: string, or (column, dict) to choose the prefix per row
+        col: column holding the id
+        spaces: replace spaces in the id by _ (volume ids)
+    """
+    if isinstance(prefix, tuple):
+        prefix=(prefix[0], tuple(prefix[1].items()))
+    return Ref(prefix, col, spaces)
+
+def lit(col, datatype=None):
+    """
+    Literal spec: column values typed with datatype, or converted with prepareValue
+    """
+    return Lit(col, datatype)
+
+def mapped(col, mapping):
+    """
+    Node spec: column values looked up in mapping
+    """
+    return Mapped(col, tuple(mapping.items()))
+
+def properties(subject, mapping, datatypes=None):
+    """
+    Shorthand for data properties of one subject
+    Input: subject spec, {predicate: column}, optional {predicate: datatype}
+    Output: list of triple specs
+    """
+    datatypes=datatypes or {}
+    return [(subject, p, lit(col, datatypes.get(p))) for p, col in mapping.items()]
+
+def columns(triples):
+    """
+    Dataframe columns read by a list of triple specs (masks are not inspected)
+    Output: sorted list of column names
+    """
+    out=set()
+    for spec in triples:
+        for term in spec[:3]:
+            if isinstance(term, Ref):
+                out.add(term.col)
+                if isinstance(term.prefix, tuple):
+                    out.add(term.prefix[0])
+            elif isinstance(term, (Lit, Mapped)):
+                out.add(term.col)
+    return sorted(out)
+
+def ref_columns(triples):
+    """
+    Id columns of the URIs built by a list of triple specs
+    Output: sorted list of column names
+    """
+    return sorted(set(term.col for spec in triples for term in spec[:3] if isinstance(term, Ref)))
+
+#=============================================================================#
+#                                 EMISSION                                    #
+#=============================================================================#
+
+def resolve(df, spec):
+    """
+    Builds the column of rdflib terms described by spec for all rows of df
+    Output: numpy object array
+    """
+    if isinstance(spec, Node):
+        out=np.empty(len(df), dtype=object)
+        out[:]=[spec]*len(df)
+        return out
+    if isinstance(spec, Ref):
+        ids=df[spec.col].astype(str)
+        if spec.spaces:
+            ids=ids.str.replace(' ', '_', regex=False)
+        if isinstance(spec.prefix, tuple):
+            col, items = spec.prefix
+            prefix=df[col].map(dict(items))
+        else:
+            prefix=spec.prefix
+        return pool.column(str(sdm) + prefix + ids, URIRef)
+    if isinstance(spec, Lit):
+        if spec.datatype is not None:
+            return typed_literals(df[spec.col], spec.datatype)
+        return df[spec.col].map(prepareValue).to_numpy(dtype=object)
+    if isinstance(spec, Mapped):
+        return df[spec.col].map(dict(spec.items)).to_numpy(dtype=object)
+    raise TypeError(f'Unknown term spec: {spec!r}')
+
+def emit(g, df, triples):
+    """
+    Adds the triples described by the specs for every row of df, one column at a time
+    Input:
+        g: graph (or any sink with addN, or add_columns to receive the columns as they are)
+        df: dataframe
+        triples: list of (subject, predicate, object) specs, with an optional fourth
+                 element: a function df -> boolean mask restricting the rows
+    Output: number of triples emitted
+    The columns are also counted by the statistics in collectors (see stats.collect).
+    """
+    columns={}
+    def column(spec):
+        if spec not in columns:
+            columns[spec]=resolve(df, spec)
+        return columns[spec]
+
+    total=0
+    for spec in triples:
+        s, p, o = (column(i) for i in spec[:3])
+        if len(spec)>3:
+            mask=np.asarray(spec[3](df), dtype=bool)
+            s, p, o = s[mask], p[mask], o[mask]
+        if hasattr(g, 'add_columns'):
+            g.add_columns(s, p, o)
+        else:
+            g.addN(zip(s, p, o, [g]*len(s)))
+        for stats in collectors:
+            stats.add_columns(s, p, o)
+        total+=len(s)
+    return total
+
+#=============================================================================#
+#                                STREAMING                                    #
+#=============================================================================#
+
+def nt_term(term):
+    """
+    N-Triples representation of a term
+    Input: URIRef, BNode or Literal
+    Output: string
+    """
+    if isinstance(term, Literal):
+        lex=(str(term).replace('\\', '\\\\').replace('"', '\\"')
+             .replace('\n', '\\n').replace('\r', '\\r'))
+        if term.language:
+            return f'"{lex}"@{term.language}'
+        if term.datatype:
+            return f'"{lex}"^^<{term.datatype}>'
+        return f'"{lex}"'
+    if isinstance(term, BNode):
+        return f'_:{term}'
+    return f'<{term}>'
+
+# File suffix of each compression
+SUFFIXES={None:'', 'gzip':'.gz', 'zstd':'.zst'}
+
+def compressor(compress, raw):
+    """
+    Compressed stream (one gzip member or zstd frame) written on top of an open binary file.
+    Closing it does not close the file, and members/frames written one after the other form a valid file.
+    Input: None, 'gzip' or 'zstd', binary file
+    """
+    if compress=='gzip':
+        return gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6)
+    if compress=='zstd':
+        if zstandard is None:
+            raise ImportError('zstd compression requires the zstandard package')
+        return zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=False)
+    return raw
+
+def decompressed(path, compress):
+    'Binary file object reading a file written by compressor'
+    if compress=='gzip':
+        return gzip.open(path, 'rb')
+    if compress=='zstd':
+        return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), read_across_frames=True, closefd=True)
+    return open(path, 'rb')
+
+class NTriplesWriter:
+    """
+    Streaming sink with the add/addN interface of rdflib.Graph, so it can replace g in the converters.
+    Triples are written as N-Triples (or N-Quads when a graph name is given) to a buffered,
+    optionally compressed file as soon as they are produced, so they are not collected in a
+    graph (the dataframes and the term columns of the converter being run are still in memory).
+    Triples are not deduplicated (the triplestore does it on load). Triples whose subject is
+    not a URI or blank node (the generalized triples of the RDFS closure) are dropped, as by the
+    RDF/XML serializer, since N-Triples parsers reject them.
+    With max_bytes, the output is split into numbered files (output-0001.nt, output-0002.nt, ...)
+    of at most max_bytes uncompressed bytes each, cut at line boundaries.
+    Input:
+        path: output file
+        compress: None, 'gzip' (or True) or 'zstd'
+        graph: graph name (URIRef) to write N-Quads instead of N-Triples
+        buffer_size: bytes buffered before writing to disk
+        max_bytes: maximum size of each file
+    """
+    def __init__(self, path, compress=None, graph=None, buffer_size=1<<20, max_bytes=None):
+        self.path=path
+        self.compress='gzip' if compress is True else (compress or None)
+        self.graph=graph
+        self.max_bytes=max_bytes
+        self.buffer_size=buffer_size
+        self.count=0
+        self.paths=[]
+        self._suffix=f' {nt_term(graph)} .\n' if graph is not None else ' .\n'
+        self._open()
+
+    def _open(self):
+        'Start the next output file'
+        if self.max_bytes:
+            folder, name = os.path.split(self.path)
+            stem, dot, ext = name.partition('.')
+            path=os.path.join(folder, f'{stem}-{len(self.paths)+1:04d}{dot}{ext}')
+        else:
+            path=self.path
+        self.paths.append(path)
+        self._raw=open(path, 'wb', buffering=self.buffer_size)
+        self._file=compressor(self.compress, self._raw)
+        self._size=0
+
+    def _close(self):
+        if self.compress:
+            self._file.close()
+        self._raw.close()
+
+    def _write(self, data):
+        'Write whole lines, starting a new file when max_bytes is reached'
+        while self.max_bytes and self._size+len(data)>self.max_bytes:
+            cut=data.rfind(b'\n', 0, self.max_bytes-self._size)+1
+            if cut==0 and self._size==0:
+                # a single line longer than max_bytes gets its own file
+                cut=data.find(b'\n')+1
+            self._file.write(data[:cut])
+            data=data[cut:]
+            self._close()
+            self._open()
+        self._file.write(data)
+        self._size+=len(data)
+
+    def bind(self, prefix, namespace, *args, **kwargs):
+        'Prefixes do not exist in N-Triples'
+        pass
+
+    def add(self, triple):
+        self.addN([(*triple, None)])
+
+    def addN(self, quads, chunk=100000):
+        suffix=self._suffix
+        quads=iter(quads)
+        while True:
+            lines=[f'{nt_term(s)} {nt_term(p)} {nt_term(o)}{suffix}' for s, p, o, c in islice(quads, chunk)
+                   if isinstance(s, (URIRef, BNode))]
+            if not lines:
+                break
+            self._write(''.join(lines).encode('utf-8'))
+            self.count+=len(lines)
+
+    def __len__(self):
+        return self.count
+
+    def append(self, path, count):
+        """
+        Append a file written by another NTriplesWriter with the same compress and graph settings
+        (e.g. a shard produced by a worker process). The bytes are copied as they are, unless the
+        output is split, in which case the lines are rewritten.
+        Input: path of the file, number of triples it holds
+        """
+        if self.max_bytes:
+            with decompressed(path, self.compress) as f:
+                rest=b''
+                for block in iter(lambda: f.read(1<<20), b''):
+                    block=rest+block
+                    cut=block.rfind(b'\n')+1
+                    self._write(block[:cut])
+                    rest=block[cut:]
+                if rest:
+                    self._write(rest)
+        else:
+            if self.compress:
+                self._file.close()
+            with open(path, 'rb') as f:
+                shutil.copyfileobj(f, self._raw, 1<<20)
+            if self.compress:
+                self._file=compressor(self.compress, self._raw)
+        self.count+=count
+
+    def close(self, verbose=True):
+        self._close()
+        if verbose:
+            files=f' ({len(self.paths)} files)' if len(self.paths)>1 else ''
+            print(f'Written {self.count} triples to {self.paths[0]}{files}')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+SPARQL workload of the project: the queries of ../query and the graphs they run on.
+A layout is one way of deploying the outputs:
+    materialized: output_graph_inference (B)
+    asserted: output_tbox, output_abox and output_link (B1 with B2-B3, or B1, B2 and B3)
+              without inference
+    rewritten: the asserted graph, with the queries rewritten over the TBOX (rewrite.py)
+    lean: the asserted graph with the lean RDFS closure computed when it is loaded
+The rdfs:subClassOf* and rdfs:subPropertyOf* paths are answered from the closure table of
+hierarchy.py (output_hierarchy, or the hierarchies of the loaded graph if there is none).
+The queries are reordered by optimize.py with the statistics saved by the generator
+(<output>.stats.json): those of output_graph_inference for the materialized layout, the union
+of those of the asserted outputs otherwise. For the lean layout, the triples added by the lean
+closure are counted as it adds them. The graph is only scanned for them when the files are missing.
+"""
+
+#=============================================================================#
+#                              PRELIMINARIES                                  #
+#=============================================================================#
+
+import os, glob, time
+import numpy as np
+from rdflib.plugins.sparql import prepareQuery
+from export import load_output, output_files
+from rdfs import materialize
+from rewrite import Rewriter
+from optimize import Optimizer
+from hierarchy import Hierarchy, HierarchyGraph
+from stats import Statistics, collect, stats_path
+
+LAYOUTS=['materialized', 'asserted', 'rewritten', 'lean']
+
+#=============================================================================#
+#                                FUNCTIONS                                    #
+#=============================================================================#
+
+def queries(folder='../query'):
+    """
+    Queries of a folder
+    Output: dict file name without extension -> query text
+    """
+    out={}
+    for path in sorted(glob.glob(os.path.join(folder, '*.rq'))):
+        with open(path) as f:
+            out[os.path.splitext(os.path.basename(path))[0]]=f.read()
+    return out
+
+def available(folder):
+    'Layouts whose outputs are in folder'
+    has=lambda name: bool(output_files(folder, name))
+    asserted=has('output_tbox') and has('output_abox')
+    return [layout for layout in LAYOUTS if (has('output_graph_inference') if layout=='materialized' else asserted)]
+
+def layout_statistics(folder, layout, g, inferred=None):
+    """
+    Statistics of the graph of a layout, read from the files saved with the outputs
+    Input: folder with the outputs, layout, loaded graph (scanned if the files are missing),
+           Statistics of the triples added by the lean closure
+    Output: stats.Statistics
+    """
+    path=lambda name: os.path.join(folder, stats_path(name))
+    inferred_path=path('output_graph_inference')
+    if layout=='materialized' and os.path.exists(inferred_path):
+        return Statistics.load(inferred_path)
+    # B2-B3 writes the links in the ABOX
+    names=[name for name in ['output_tbox', 'output_abox', 'output_link'] if output_files(folder, name)]
+    if layout!='materialized' and all(os.path.exists(path(name)) for name in names):
+        parts=[Statistics.load(path(name)) for name in names]
+        if layout!='lean':
+            return Statistics.union(parts)
+        if inferred is not None:
+            return Statistics.union(parts+[inferred])
+    return Statistics.of(g)
+
+def load_layout(folder, layout, optimize=True):
+    """
+    Graph of a layout and the function preparing its queries
+    Input: folder with the outputs, layout (see LAYOUTS), reorder the BGPs with optimize.py
+    Output: (graph, function (query text, parameters bound when it runs) -> prepared query,
+             load time in seconds)
+    """
+    start=time.perf_counter()
+    g=HierarchyGraph()
+    parse=prepareQuery
+    inferred=None
+    if layout=='materialized':
+        load_output(g, folder, 'output_graph_inference')
+    else:
+        for name in ['output_tbox', 'output_abox', 'output_link']:
+            # B2-B3 writes the links in the ABOX
+            if name!='output_link' or output_files(folder, name):
+                load_output(g, folder, name)
+        if layout=='rewritten':
+            parse=Rewriter(g).rewrite
+        elif layout=='lean':
+            with collect(Statistics()) as inferred:
+                materialize(g, profile='lean')
+            inferred.freeze()
+    # The closure table has the TBOX hierarchies only, the inferred graph has more (rdfs:Resource)
+    if layout!='materialized' and output_files(folder, 'output_hierarchy'):
+        table=HierarchyGraph()
+        load_output(table, folder, 'output_hierarchy')
+        g.hierarchy=Hierarchy(table, table=True)
+    else:
+        g.hierarchy=Hierarchy(g)
+    if optimize:
+        optimizer=Optimizer(layout_statistics(folder, layout, g, inferred))
+        prepare=lambda text, bound=(): optimizer.optimize(parse(text), bound=bound)
+    else:
+        prepare=lambda text, bound=(): parse(text)
+    return g, prepare, time.perf_counter()-start
+
+def percentiles(times):
+    'p50 and p95 of a list of durations in seconds, in milliseconds'
+    p50, p95 = np.percentile(np.asarray(times)*1000, [50, 95])
+    return p50, p95
+
+def timed(g, query, runs=20, warmup=3):
+    """
+    Run a prepared query several times
+    Output: (list of durations in seconds of the timed runs, number of answers)
+    """
+    for _ in range(warmup):
+        len(g.query(query))
+    times=[]
+    for _ in range(runs):
+        start=time.perf_counter()
+        n=len(g.query(query))
+        times.append(time.perf_counter()-start)
+    return times, n
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Shared fixtures: the scripts' modules (in ../code) and a small data folder with the csv files
+read by prepare.prepare.
+"""
+
+import os, sys
+import numpy as np
+import pandas as pd
+import pytest
+from faker import Faker
+from rdflib import Graph
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'code'))
+
+def write_data(folder, n=30):
+    'csv files of n authors, 2n papers and n/10 conferences and journals in folder'
+    rng=np.random.default_rng(1)
+    csv=lambda df, name: df.to_csv(os.path.join(folder, name), index=False)
+    csv(pd.DataFrame({'authorId':range(1, n+1), 'institutionid':[i%5 for i in range(n)], 'affiliations':'x',
+                      'homepage':'h', 'fake':False, 'hIndex':[np.nan if i%7==0 else float(i%20) for i in range(n)],
+                      'paperCount':1, 'citationCount':2, 'name':[f'Author {i}' for i in range(1, n+1)],
+                      'url':[f'http://a/{i}' for i in range(n)]}), 'authors.csv')
+    csv(pd.DataFrame({'intitutionid':range(5), 'name':[f'Inst {i}' for i in range(5)]}), 'institutions.csv')
+    papers=list(range(1000, 1000+2*n))
+    csv(pd.DataFrame({'id':papers, 'sha':'s', 'fake':False, 'abstract':[np.nan if i%3==0 else f'abs {i}' for i in range(2*n)],
+                      'url':'u', 'title':[f'Paper {i}' for i in range(2*n)]}), 'paper.csv')
+    nv=max(3, n//10)
+    csv(pd.DataFrame({'id':range(1, nv+1), 'name':[f'Conf{i}' for i in range(nv)], 'url':'u',
+                      'issn':[np.nan if i%2 else f'1234-{i}' for i in range(nv)]}), 'conference.csv')
+    csv(pd.DataFrame({'conference':range(1, nv+1), 'edition':range(101, 101+nv), 'proceeding':range(101, 101+nv),
+                      'fake':False}), 'holds.csv')
+    csv(pd.DataFrame({'id':range(101, 101+nv), 'conference':range(1, nv+1), 'fake':False, 'venue':'Barcelona',
+                      'Start':'2019-01-01', 'End':'2019-01-03', 'year':2019,
+                      'chairperson':[i+1 if i%2 else np.nan for i in range(nv)]}), 'edition.csv')
+    csv(pd.DataFrame({'id':range(1, nv+1), 'name':[f'J{i}' if i%3 else np.nan for i in range(nv)], 'url':'u',
+                      'issn':np.nan, 'editor':[i+2 if i%2 else 99999 for i in range(nv)]}), 'journal.csv')
+    csv(pd.DataFrame({'volume':[f'vol {i}' for i in range(nv)], 'journal':range(1, nv+1), 'fake':False}), 'volume_of.csv')
+    csv(pd.DataFrame({'id':[f'vol {i}' for i in range(nv)], 'volume':1, 'fake':False, 'year':2020}), 'volume.csv')
+    dates=lambda year, k: [f'{year}-0{1+i%9}-1{i%9}' for i in range(k)]
+    half=n
+    csv(pd.DataFrame({'paper':papers[:half], 'edition':[101+i%nv for i in range(half)], 'fake':False,
+                      'submitted_date':dates(2018, half), 'published_date':dates(2019, half)}), 'submitted_to_conference.csv')
+    csv(pd.DataFrame({'paper':papers[half:], 'volume':[f'vol {i%nv}' for i in range(half)], 'fake':False,
+                      'submitted_date':dates(2018, half), 'published_date':dates(2019, half)}), 'submitted_to_journal.csv')
+    csv(pd.DataFrame([(p, r, int((p+r)%3>0), f'content {p}-{r}') for p in papers for r in rng.choice(range(1, n+1), 3, replace=False)],
+                     columns=['paper', 'reviewerid', 'decision', 'content']), 'reviews.csv')
+    csv(pd.DataFrame([(p, a, False) for p in papers for a in rng.choice(range(1, n+1), 2, replace=False)],
+                     columns=['paper', 'author', 'fake']), 'writes.csv')
+    csv(pd.DataFrame({'community':['Database', 'ML', 'Systems', 'Database', 'Theory']}), 'topic.csv')
+
+def abox_triples(links=False):
+    'Triples of the ABOX of the csv files of the current folder (with the rdf:type links of B)'
+    import ingest, abox
+    from prepare import prepare
+    ingest._loaded.clear()
+    frames=prepare(Faker(), 123)
+    g=Graph()
+    for name in ['area', 'author', 'review', 'hasAuthor', 'hasTopic']:
+        getattr(abox, f'{name.lower()}_to_rdf')(g, frames[name])
+    for name in ['conference', 'journal', 'volume', 'proceeding', 'paper']:
+        getattr(abox, f'{name}_to_rdf')(g, frames[name], links=links)
+    return set(g)
+
+@pytest.fixture
+def data(tmp_path, monkeypatch):
+    'Data folder with the csv files, as the current folder'
+    write_data(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+@pytest.fixture
+def abox(data):
+    'Function returning the ABOX triples of the data folder (see abox_triples)'
+    return abox_triples
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Request/response path of the SPARQL endpoint: status codes, result formats and a client
+request to a server whose worker processes are started before it listens.
+"""
+
+import asyncio
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+import pytest
+from rdflib import Graph, Literal
+from rdflib.plugins.sparql import prepareQuery
+from triples import sdm
+import endpoint
+
+SELECT='PREFIX sdm: <http://example.org/sdm#> SELECT ?name WHERE { ?a sdm:hasPersonName ?name }'
+ASK='PREFIX sdm: <http://example.org/sdm#> ASK { ?a sdm:hasPersonName "Ana" }'
+
+@pytest.fixture
+def served(monkeypatch):
+    'Small graph served by the endpoint module'
+    g=Graph()
+    g.add((sdm.Author_1, sdm.hasPersonName, Literal('Ana')))
+    monkeypatch.setattr(endpoint, '_graph', g)
+    monkeypatch.setattr(endpoint, '_prepare', lru_cache(maxsize=endpoint.PLAN_CACHE_SIZE)(prepareQuery))
+    return g
+
+def respond(text, accept=''):
+    async def run():
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return await endpoint.Endpoint(pool).respond('GET', '/sparql?'+endpoint.urlencode({'query':text}),
+                                                         {'accept':accept}, b'')
+    return asyncio.run(run())
+
+def test_select_formats(served):
+    assert respond(SELECT, 'text/csv')==(200, 'text/csv', b'name\r\nAna\r\n')
+    status, content_type, body = respond(SELECT)
+    assert (status, content_type)==(200, 'application/sparql-results+json') and b'Ana' in body
+
+def test_ask_as_csv_falls_back_to_json(served):
+    assert respond(ASK, 'text/csv')==(200, 'application/sparql-results+json', b'{"head":{},"boolean":true}')
+
+def test_errors(served, monkeypatch):
+    assert respond('SELEC ?x')[0]==400
+    assert respond('')[0]==400
+    class Failing(Graph):
+        def query(self, *args, **kwargs):
+            raise RuntimeError('store failure')
+    monkeypatch.setattr(endpoint, '_graph', Failing())
+    assert respond(SELECT)[:2]==(500, 'text/plain')
+
+def test_request_to_server(served):
+    async def run(pool):
+        server=await asyncio.start_server(endpoint.Endpoint(pool).handle, 'localhost', 0)
+        port=server.sockets[0].getsockname()[1]
+        async with server:
+            # The first connection is closed after its response (no worker forked meanwhile holds it)
+            reader, writer = await asyncio.open_connection('localhost', port)
+            writer.write(b'GET /sparql?query=ASK%7B%7D HTTP/1.1\r\nConnection: close\r\n\r\n')
+            response=await asyncio.wait_for(reader.read(), 20)
+            writer.close()
+            results=await asyncio.wait_for(asyncio.gather(*[endpoint.request(f'http://localhost:{port}/sparql', SELECT)
+                                                            for _ in range(4)]), 20)
+            return results, response
+    with ProcessPoolExecutor(max_workers=2, mp_context=mp.get_context('fork')) as pool:
+        endpoint.start_workers(pool, 2)
+        results, response = asyncio.run(run(pool))
+    assert all(status==200 and b'Ana' in body for status, _, body in results)
+    assert response.startswith(b'HTTP/1.1 200 OK') and response.endswith(b'"boolean":true}')
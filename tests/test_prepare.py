@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+The synthetic fields of a row only depend on its id: a one-row csv edit gives an O(1) ABOX delta.
+"""
+
+import pandas as pd
+
+def edit(name, change):
+    'Apply change to a csv file of the current folder'
+    change(pd.read_csv(name)).to_csv(name, index=False)
+
+def subjects(triples):
+    return {str(s).rsplit('#', 1)[-1] for s, p, o in triples}
+
+def test_same_seed_same_abox(abox):
+    assert abox()==abox()
+
+def test_added_author(abox):
+    before=abox()
+    edit('authors.csv', lambda df: pd.concat([df, df.tail(1).assign(authorId=31, name='Author 31')]))
+    after=abox()
+    assert not before-after
+    assert subjects(after-before)=={'Author_31'}
+    assert len(after-before)<=10
+
+def test_renamed_author(abox):
+    before=abox()
+    edit('authors.csv', lambda df: df.assign(name=df.name.where(df.authorId!=7, 'Renamed')))
+    after=abox()
+    assert len(before^after)==2
+    assert subjects(before^after)=={'Author_7'}
+
+def test_removed_paper_abstract(abox):
+    before=abox()
+    edit('paper.csv', lambda df: df.assign(abstract=df.abstract.where(df.id!=1001)))
+    after=abox()
+    # The abstract of the paper is synthesized instead, nothing else changes
+    assert len(before^after)==2
+    assert subjects(before^after)=={'Paper_1001'}
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Answers of the queries of ../query on the local query path against their plain evaluation on
+the materialized graph.
+"""
+
+import os
+from collections import Counter
+import pytest
+from rdflib import Graph, XSD
+from rdflib.plugins.sparql import prepareQuery
+from rdfs import materialize
+from rewrite import Rewriter
+from optimize import Optimizer
+from stats import Statistics
+from hierarchy import Hierarchy, HierarchyGraph, closure_table
+from tbox import tbox_to_rdf
+from templates import Templates
+from triples import sdm
+from workload import queries
+
+QUERY_FOLDER=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'query')
+QUERIES=queries(QUERY_FOLDER)
+TEMPLATES=queries(os.path.join(QUERY_FOLDER, 'templates'))
+
+def graph(triples, cls=Graph):
+    g=cls()
+    g.addN((s, p, o, g) for s, p, o in triples)
+    return g
+
+def answers(g, query):
+    'Rows of a query (text or prepared)'
+    return Counter(g.query(query))
+
+@pytest.fixture
+def asserted(abox):
+    'TBOX, ABOX and links, as loaded from B1, B2 and B3'
+    g=Graph()
+    tbox_to_rdf(g, verbose=False)
+    return set(g)|abox(links=True)
+
+@pytest.fixture
+def materialized(asserted):
+    'Graph of B: the asserted triples with their RDFS closure'
+    g=graph(asserted)
+    materialize(g)
+    return g
+
+def test_rewritten_queries_match_materialized(asserted, materialized):
+    g=graph(asserted)
+    rewriter=Rewriter(g)
+    for name, text in QUERIES.items():
+        expected=answers(materialized, text)
+        assert answers(g, rewriter.rewrite(text))==expected, name
+    # query1 only finds its authors through the closure or the rewriting
+    assert answers(materialized, QUERIES['query1']) and not answers(g, QUERIES['query1'])
+
+def test_reordered_queries_match_plain(materialized):
+    optimizer=Optimizer(Statistics.of(materialized))
+    found=0
+    for name, text in QUERIES.items():
+        expected=answers(materialized, prepareQuery(text))
+        assert answers(materialized, optimizer.optimize(text))==expected, name
+        found+=bool(expected)
+    # Every query but query4 has answers on the test data
+    assert found==len(QUERIES)-1
+
+@pytest.mark.parametrize('name', ['query2_case2', 'query3_case2'])
+def test_hierarchy_paths_match_plain(asserted, materialized, name):
+    text=QUERIES[name]
+    expected=set(answers(materialized, text))
+    assert expected
+    # Index built from the graph, and from the closure table of the TBOX as B1 writes it
+    g=graph(materialized, HierarchyGraph)
+    g.hierarchy=Hierarchy(g)
+    assert set(answers(g, text))==expected
+    g=graph(asserted, HierarchyGraph)
+    g.hierarchy=Hierarchy(closure_table(g), table=True)
+    assert set(answers(g, text))==set(answers(graph(asserted), text))
+
+@pytest.mark.parametrize('name, values', [('query2_case2', {'class':sdm.Chair}),
+                                          ('query2_case2', {'class':sdm.Paper}),
+                                          ('query4', {'authorName':'Author 3', 'topicName':'Database'})])
+def test_templates_match_written_values(materialized, name, values):
+    optimizer=Optimizer(Statistics.of(materialized))
+    templates=Templates(materialized, lambda text, bound=(): optimizer.optimize(text, bound=bound))
+    text=TEMPLATES[name]
+    template=templates.compile(text)
+    written=text
+    for k, v in template.bindings(values).items():
+        written=written.replace(f'${k}', v.n3())
+    assert Counter(templates.run(text, **values))==answers(materialized, written)
+    if name=='query2_case2':
+        assert answers(materialized, written)
+    else:
+        assert template.datatypes=={'authorName':XSD.string, 'topicName':XSD.string}
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+rdfs.Closure.update against the closure recomputed from scratch (materialize and owlrl), and
+the delta files written from its changes.
+"""
+
+import random
+import pytest
+from owlrl import DeductiveClosure, RDFS_Semantics
+from rdflib import Graph, Literal, URIRef, RDF, XSD
+from rdfs import Closure, materialize
+from tbox import tbox_to_rdf
+from triples import sdm
+from incremental import write_changes
+
+def graph(triples):
+    g=Graph()
+    g.addN((s, p, o, g) for s, p, o in triples)
+    return g
+
+def closure(triples):
+    'Closure recomputed by materialize'
+    g=graph(triples)
+    materialize(g)
+    return set(g)
+
+def batch(rnd, abox, step):
+    'Random triples to delete from and insert into the ABOX: new subjects and retyped literals'
+    delete=set(rnd.sample(sorted(abox), rnd.randint(1, 200)))
+    insert={(sdm[f'Author_new{step}'], RDF.type, sdm.Author)}
+    for s, p, o in rnd.sample(sorted(abox), 150):
+        if rnd.random()<0.5:
+            s=URIRef(f'{s}_new{step}')
+        if isinstance(o, Literal) and rnd.random()<0.5:
+            o=Literal(float(o.value), datatype=XSD.float) if isinstance(o.value, int) else Literal(str(o))
+        insert.add((s, p, o))
+    return insert, delete
+
+@pytest.fixture
+def tbox():
+    g=Graph()
+    tbox_to_rdf(g, verbose=False)
+    return set(g)
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_update_matches_materialize(abox, tbox, seed):
+    asserted=tbox|abox(links=True)
+    c=Closure(graph(asserted))
+    g=graph(asserted)
+    c.materialize(g)
+    assert set(c)==closure(asserted)
+    rnd=random.Random(seed)
+    for step in range(5):
+        insert, delete = batch(rnd, asserted-tbox, step)
+        before=set(c)
+        added, removed = c.update(insert, delete, g)
+        asserted=(asserted-delete)|insert
+        expected=closure(asserted)
+        assert set(c)==expected==set(g)
+        assert len(c)==len(expected)
+        assert (added, removed)==(expected-before, before-expected)
+    # Deleting the whole ABOX leaves the closure of the TBOX
+    c.update((), asserted-tbox, g)
+    assert set(c)==closure(tbox)==set(g)
+
+def test_update_matches_owlrl(abox, tbox):
+    asserted=tbox|abox(links=True)
+    c=Closure(graph(asserted))
+    rnd=random.Random(3)
+    for step in range(3):
+        insert, delete = batch(rnd, asserted-tbox, step)
+        c.update(insert, delete)
+        asserted=(asserted-delete)|insert
+    g=graph(asserted)
+    DeductiveClosure(RDFS_Semantics).expand(g)
+    assert set(c)==set(g)
+
+def test_delta_files_parse(abox, tbox, tmp_path):
+    asserted=tbox|abox(links=True)
+    c=Closure(graph(asserted))
+    insert, delete = batch(random.Random(4), asserted-tbox, 0)
+    added, removed = c.update(insert, delete)
+    assert any(isinstance(s, Literal) for s, p, o in added|removed)
+    counts=write_changes(str(tmp_path), 'output_graph_inference', added, removed)
+    for suffix, triples, count in zip(['add', 'delete'], [added, removed], counts):
+        g=Graph().parse(tmp_path/f'output_graph_inference_{suffix}.nt', format='nt')
+        assert set(g)=={t for t in triples if not isinstance(t[0], Literal)}
+        assert len(g)==count